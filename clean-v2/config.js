@@ -5,10 +5,12 @@ export const config = {
   tmdb: {
     baseUrl: "https://api.themoviedb.org/3",
     rateLimit: {
-      requestsPerSecond: 2,
-      delayMs: 500,
+      capacity: 40,
+      refillRate: 40, // tokens per second
     },
-    retries: 3,
+    concurrency: 40,
+    cacheTtlMs: 7 * 24 * 60 * 60 * 1000, // 7 days
+    retries: 4,
     timeout: 30000,
   },
 
@@ -19,6 +21,10 @@ export const config = {
     rateLimit: {
       delayMs: 200,
     },
+    // Sent with every Wikipedia request (their API policy requires a descriptive User-Agent)
+    headers: {
+      "User-Agent": "MediaRecommendationSystem/1.0 (https://github.com/example; contact@example.com)",
+    },
   },
 
   openai: {
@@ -28,12 +34,20 @@ export const config = {
     batchSize: 500,
     delayBetweenBatches: 1000,
     retries: 2,
+    concurrency: 5,
+    rateLimit: {
+      capacity: 5,
+    },
+    cacheTtlMs: 30 * 24 * 60 * 60 * 1000, // 30 days
   },
 
   pipeline: {
     defaultBatchSize: 1000,
     checkpointInterval: 100,
+    updateBatchSize: 100,
+    queueSize: 100,
     logDir: "clean-v2/logs",
+    cacheDir: "clean-v2/cache",
   },
 };
 
@@ -18,7 +18,7 @@ export async function generateEmbeddingsForTitles(titles) {
     return new Map();
   }
 
-  log.info(`Generating embeddings for ${titles.length} titles`);
+  log.debug(`Generating embeddings for ${titles.length} titles`);
 
   // Build texts for each embedding type
   const vibeTexts = [];
@@ -33,15 +33,14 @@ export async function generateEmbeddingsForTitles(titles) {
     metadataTexts.push(buildMetadataText(title));
   }
 
-  // Generate all embeddings in parallel
-  log.debug("Generating vibe embeddings...");
-  const vibeEmbeddings = await generateEmbeddingsBatch(vibeTexts);
+  // Generate all three embedding types in one request: the texts share a
+  // model and dimensions, so they can go in a single input array
+  const count = titleIds.length;
+  const embeddings = await generateEmbeddingsBatch([...vibeTexts, ...contentTexts, ...metadataTexts]);
 
-  log.debug("Generating content embeddings...");
-  const contentEmbeddings = await generateEmbeddingsBatch(contentTexts);
-
-  log.debug("Generating metadata embeddings...");
-  const metadataEmbeddings = await generateEmbeddingsBatch(metadataTexts);
+  const vibeEmbeddings = embeddings.slice(0, count);
+  const contentEmbeddings = embeddings.slice(count, count * 2);
+  const metadataEmbeddings = embeddings.slice(count * 2, count * 3);
 
   // Map results to title IDs
   const results = new Map();
@@ -54,7 +53,7 @@ export async function generateEmbeddingsForTitles(titles) {
     });
   }
 
-  log.info(`Generated embeddings for ${results.size} titles`);
+  log.debug(`Generated embeddings for ${results.size} titles`);
 
   return results;
 }
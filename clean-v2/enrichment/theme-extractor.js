@@ -2,12 +2,26 @@
  * Extract themes from content using LLM
  */
 
+import { createHash } from "crypto";
 import { chatCompletion, parseJsonResponse } from "./openai-client.js";
 import { THEMES, validateThemes } from "../schema.js";
+import { config } from "../config.js";
 import { createLogger } from "../lib/logger.js";
+import { DiskCache } from "../lib/cache.js";
 
 const log = createLogger("[Themes]");
 
+// Results for identical inputs are reused across runs so reruns don't re-bill the LLM
+const themeCache = new DiskCache("themes");
+let diskCacheEnabled = true;
+
+// In-process layer in front of the disk cache (insertion-ordered, oldest evicted first)
+const MEMO_MAX_SIZE = 4096;
+const memo = new Map();
+
+// Pending lookups by key, so concurrent callers with identical inputs share one LLM call
+const inflight = new Map();
+
 const SYSTEM_PROMPT = `You are a film/TV analyst extracting thematic elements from content.
 
 Your task is to identify the main themes present in the content.
@@ -22,6 +36,127 @@ Respond with ONLY a JSON object in this exact format:
   "themes": ["theme1", "theme2", "theme3"]
 }`;
 
+// Per-title user prompts. Only the short fields below change between calls.
+const contentPrompt = (title, content) => `Analyze this content and identify the main themes:
+
+Title: ${title}
+
+Content:
+${content}
+
+Extract the themes.`;
+
+const overviewPrompt = (title, genreList, overview) => `Analyze this content and identify the main themes:
+
+Title: ${title}
+${genreList ? `Genres: ${genreList}\n` : ""}
+Overview:
+${overview || "No overview available"}
+
+Extract the themes based on the available information.`;
+
+// Changes whenever the model, prompts or THEMES list change, so stale themes are never served
+const PROMPT_VERSION = createHash("sha256")
+  .update(
+    [
+      config.openai.chatModel,
+      SYSTEM_PROMPT,
+      contentPrompt("{title}", "{content}"),
+      overviewPrompt("{title}", "{genres}", "{overview}"),
+    ].join("\n")
+  )
+  .digest("hex");
+
+/**
+ * Enable or disable the on-disk theme cache (e.g. for --no-cache runs)
+ * The in-process memo is unaffected.
+ * @param {boolean} enabled
+ */
+export function setThemeCacheEnabled(enabled) {
+  diskCacheEnabled = enabled;
+}
+
+/**
+ * Build a cache key from the inputs that determine the themes
+ * @param {...string} parts
+ * @returns {string}
+ */
+function themeKey(...parts) {
+  return createHash("sha256").update([PROMPT_VERSION, ...parts].join("|")).digest("hex");
+}
+
+/**
+ * Return cached themes for a key, or generate and cache them
+ * Checks the in-process memo first, then joins an identical in-flight
+ * request if there is one, then falls back to the disk cache and the LLM.
+ * @param {string} key - From themeKey()
+ * @param {string} title - Title (for logging)
+ * @param {Function} generate - Async function producing the themes
+ * @returns {Promise<string[]>}
+ */
+async function memoizeThemes(key, title, generate) {
+  if (memo.has(key)) {
+    return memo.get(key);
+  }
+
+  if (inflight.has(key)) {
+    log.debug(`Joining in-flight theme request for: ${title}`);
+    return inflight.get(key);
+  }
+
+  const pending = loadOrGenerateThemes(key, title, generate);
+  inflight.set(key, pending);
+
+  try {
+    return await pending;
+  } finally {
+    inflight.delete(key);
+  }
+}
+
+/**
+ * Read themes from the disk cache, or generate and store them
+ * Empty results (parse or API failures) are not cached.
+ * @param {string} key
+ * @param {string} title
+ * @param {Function} generate
+ * @returns {Promise<string[]>}
+ */
+async function loadOrGenerateThemes(key, title, generate) {
+  const cached = diskCacheEnabled ? await themeCache.get(key) : undefined;
+  if (cached) {
+    log.debug(`Cache hit for themes: ${title}`);
+    remember(key, cached);
+    return cached;
+  }
+
+  const themes = await generate();
+
+  if (themes.length === 0) return themes;
+
+  remember(key, themes);
+
+  if (diskCacheEnabled) {
+    await themeCache.set(key, themes, config.openai.cacheTtlMs).catch((error) => {
+      log.warn(`Failed to cache themes for: ${title}`, { error: error.message });
+    });
+  }
+
+  return themes;
+}
+
+/**
+ * Add themes to the in-process memo, evicting the oldest entry when full
+ * @param {string} key
+ * @param {string[]} themes
+ */
+function remember(key, themes) {
+  if (memo.size >= MEMO_MAX_SIZE) {
+    memo.delete(memo.keys().next().value);
+  }
+  memo.set(key, themes);
+}
+
 /**
  * Extract themes from content
  * @param {string} content - Wikipedia content or overview
@@ -31,37 +166,30 @@ Respond with ONLY a JSON object in this exact format:
 export async function extractThemes(content, title) {
   const contentSnippet = content?.slice(0, 3000) || "";
 
-  const userPrompt = `Analyze this content and identify the main themes:
+  return memoizeThemes(themeKey("content", title, contentSnippet), title, async () => {
+    try {
+      const response = await chatCompletion(SYSTEM_PROMPT, contentPrompt(title, contentSnippet));
+      const parsed = parseJsonResponse(response);
 
-Title: ${title}
+      if (!parsed || !Array.isArray(parsed.themes)) {
+        log.warn(`Failed to parse themes response for: ${title}`);
+        return [];
+      }
 
-Content:
-${contentSnippet}
+      // Validate against schema
+      const themes = validateThemes(parsed.themes);
 
-Extract the themes.`;
-
-  try {
-    const response = await chatCompletion(SYSTEM_PROMPT, userPrompt);
-    const parsed = parseJsonResponse(response);
+      // Log validation results
+      if (parsed.themes.length !== themes.length) {
+        log.debug(`Filtered themes for ${title}: ${parsed.themes.length} -> ${themes.length}`);
+      }
 
-    if (!parsed || !Array.isArray(parsed.themes)) {
-      log.warn(`Failed to parse themes response for: ${title}`);
+      return themes.slice(0, 5); // Max 5 themes
+    } catch (error) {
+      log.error(`Error extracting themes for: ${title}`, { error: error.message });
       return [];
     }
-
-    // Validate against schema
-    const themes = validateThemes(parsed.themes);
-
-    // Log validation results
-    if (parsed.themes.length !== themes.length) {
-      log.debug(`Filtered themes for ${title}: ${parsed.themes.length} -> ${themes.length}`);
-    }
-
-    return themes.slice(0, 5); // Max 5 themes
-  } catch (error) {
-    log.error(`Error extracting themes for: ${title}`, { error: error.message });
-    return [];
-  }
+  });
 }
 
 /**
@@ -72,29 +200,26 @@ Extract the themes.`;
  * @returns {Promise<string[]>}
  */
 export async function extractThemesFromOverview(overview, title, genres = []) {
-  const genreContext = genres.length > 0 ? `Genres: ${genres.join(", ")}\n` : "";
+  // Genre order doesn't change the prompt's meaning, so sort for a stable key
+  const key = themeKey("overview", title, overview || "", [...(genres || [])].sort().join(","));
 
-  const userPrompt = `Analyze this content and identify the main themes:
+  return memoizeThemes(key, title, async () => {
+    // Prompt keeps TMDB's order (primary genre first)
+    const genreList = (genres || []).join(", ");
 
-Title: ${title}
-${genreContext}
-Overview:
-${overview || "No overview available"}
+    try {
+      const response = await chatCompletion(SYSTEM_PROMPT, overviewPrompt(title, genreList, overview));
+      const parsed = parseJsonResponse(response);
 
-Extract the themes based on the available information.`;
+      if (!parsed || !Array.isArray(parsed.themes)) {
+        log.warn(`Failed to parse themes response for: ${title}`);
+        return [];
+      }
 
-  try {
-    const response = await chatCompletion(SYSTEM_PROMPT, userPrompt);
-    const parsed = parseJsonResponse(response);
-
-    if (!parsed || !Array.isArray(parsed.themes)) {
-      log.warn(`Failed to parse themes response for: ${title}`);
+      return validateThemes(parsed.themes).slice(0, 5);
+    } catch (error) {
+      log.error(`Error extracting themes from overview for: ${title}`, { error: error.message });
       return [];
     }
-
-    return validateThemes(parsed.themes).slice(0, 5);
-  } catch (error) {
-    log.error(`Error extracting themes from overview for: ${title}`, { error: error.message });
-    return [];
-  }
+  });
 }
@@ -21,6 +21,8 @@ const COMMANDS = {
       { flag: "--movies-only", desc: "Only process movies" },
       { flag: "--tv-only", desc: "Only process TV shows" },
       { flag: "--resume", desc: "Resume from checkpoint" },
+      { flag: "--use-cache", desc: "Reuse TMDB responses cached by earlier runs" },
+      { flag: "--min-popularity <n>", desc: "Only titles with popularity above n (0 = all)" },
     ],
   },
   enrich: {
@@ -33,6 +35,8 @@ const COMMANDS = {
       { flag: "--movies-only", desc: "Only process movies" },
       { flag: "--tv-only", desc: "Only process TV shows" },
       { flag: "--resume", desc: "Resume from checkpoint" },
+      { flag: "--min-popularity <n>", desc: "Only titles with popularity above n (0 = all)" },
+      { flag: "--no-cache", desc: "Regenerate themes instead of reusing cached results" },
     ],
   },
   "repair-tmdb": {
@@ -46,6 +50,8 @@ const COMMANDS = {
       { flag: "--field <name>", desc: "Target specific field (overview, director, etc.)" },
       { flag: "--retry-errors", desc: "Re-attempt previously failed API calls" },
       { flag: "--resume", desc: "Resume from checkpoint" },
+      { flag: "--no-cache", desc: "Ignore cached TMDB responses" },
+      { flag: "--min-popularity <n>", desc: "Only titles with popularity above n (default: 0.5, 0 = all)" },
     ],
   },
   "repair-enrichment": {
@@ -0,0 +1,182 @@
+import fs from "fs/promises";
+import path from "path";
+import { createHash } from "crypto";
+import { config } from "../config.js";
+
+// Temp files older than this are treated as abandoned by a crashed write
+const STALE_TMP_MS = 60 * 60 * 1000;
+
+/**
+ * File-backed key/value cache
+ * Survives process restarts so reruns after a partial failure don't
+ * re-fetch (or re-bill) work that already completed.
+ * Each entry is stored as its own file under config.pipeline.cacheDir/<namespace>:
+ * an expiry timestamp on the first line, followed by the value as text.
+ * Expired entries are deleted when read, and swept once per process on
+ * the first write, so the directory doesn't grow without bound.
+ */
+export class DiskCache {
+  /**
+   * @param {string} namespace - Subdirectory name (e.g., "tmdb", "themes")
+   */
+  constructor(namespace) {
+    this.dir = path.join(config.pipeline.cacheDir, namespace);
+    this.ready = null;
+  }
+
+  /**
+   * Get the file path for a key
+   * @param {string} key
+   * @returns {string}
+   */
+  pathFor(key) {
+    const hash = createHash("sha256").update(key).digest("hex");
+    return path.join(this.dir, `${hash}.cache`);
+  }
+
+  /**
+   * Read a value from the cache
+   * @param {string} key
+   * @returns {Promise<*>} - Cached value, or undefined on miss/expiry
+   */
+  async get(key) {
+    const text = await this.getRaw(key);
+    return text === undefined ? undefined : JSON.parse(text);
+  }
+
+  /**
+   * Write a value to the cache
+   * @param {string} key
+   * @param {*} value - JSON-serializable value
+   * @param {number} [ttlMs] - Time to live in ms (no expiry if omitted)
+   * @returns {Promise<void>}
+   */
+  async set(key, value, ttlMs) {
+    return this.setRaw(key, JSON.stringify(value), ttlMs);
+  }
+
+  /**
+   * Read a value as stored, without parsing
+   * @param {string} key
+   * @returns {Promise<string|undefined>} - Cached text, or undefined on miss/expiry
+   */
+  async getRaw(key) {
+    let contents;
+    try {
+      contents = await fs.readFile(this.pathFor(key), "utf8");
+    } catch {
+      // Missing or unreadable entry counts as a miss
+      return undefined;
+    }
+
+    const newline = contents.indexOf("\n");
+    const expiresAt = newline === -1 ? NaN : Number(contents.slice(0, newline));
+
+    if (isExpired(expiresAt)) {
+      await this.remove(key);
+      return undefined;
+    }
+
+    return contents.slice(newline + 1);
+  }
+
+  /**
+   * Delete an entry, ignoring entries that are already gone
+   * @param {string} key
+   * @returns {Promise<void>}
+   */
+  async remove(key) {
+    await fs.rm(this.pathFor(key), { force: true }).catch(() => {});
+  }
+
+  /**
+   * Delete all expired or unreadable entries in this namespace
+   * Only the header line of each file is read.
+   * @returns {Promise<number>} - Number of entries deleted
+   */
+  async prune() {
+    let files;
+    try {
+      files = await fs.readdir(this.dir);
+    } catch {
+      return 0;
+    }
+
+    let removed = 0;
+    for (const file of files) {
+      const filePath = path.join(this.dir, file);
+
+      if (file.endsWith(".cache")) {
+        const expiresAt = await readExpiry(filePath);
+        if (!isExpired(expiresAt)) continue;
+      } else if (file.endsWith(".tmp")) {
+        // Leftover temp files are from interrupted writes; recent ones may still be in use
+        const stat = await fs.stat(filePath).catch(() => null);
+        if (!stat || Date.now() - stat.mtimeMs < STALE_TMP_MS) continue;
+      } else {
+        continue;
+      }
+
+      await fs.rm(filePath, { force: true }).catch(() => {});
+      removed++;
+    }
+
+    return removed;
+  }
+
+  /**
+   * Write text to the cache as-is
+   * Use this when the value is already serialized (e.g., an HTTP response body)
+   * @param {string} key
+   * @param {string} text
+   * @param {number} [ttlMs] - Time to live in ms (no expiry if omitted)
+   * @returns {Promise<void>}
+   */
+  async setRaw(key, text, ttlMs) {
+    if (!this.ready) {
+      this.ready = fs.mkdir(this.dir, { recursive: true });
+      // Sweep in the background; a failed sweep only leaves stale files behind
+      this.ready.then(() => this.prune()).catch(() => {});
+    }
+    await this.ready;
+
+    const expiresAt = ttlMs ? Date.now() + ttlMs : 0;
+
+    // Write to a temp file and rename so readers never see a partial entry
+    const filePath = this.pathFor(key);
+    const tmpPath = `${filePath}.${process.pid}-${Math.random().toString(36).slice(2)}.tmp`;
+    await fs.writeFile(tmpPath, `${expiresAt}\n${text}`);
+    await fs.rename(tmpPath, filePath);
+  }
+}
+
+/**
+ * Check an entry's expiry timestamp
+ * @param {number} expiresAt - 0 for no expiry, NaN for an unreadable header
+ * @returns {boolean}
+ */
+function isExpired(expiresAt) {
+  if (Number.isNaN(expiresAt)) return true;
+  return expiresAt !== 0 && expiresAt < Date.now();
+}
+
+/**
+ * Read the expiry timestamp from the first line of a cache file
+ * @param {string} filePath
+ * @returns {Promise<number>} - NaN if the file has no valid header
+ */
+async function readExpiry(filePath) {
+  let handle;
+  try {
+    handle = await fs.open(filePath, "r");
+    const buffer = Buffer.alloc(32);
+    const { bytesRead } = await handle.read(buffer, 0, buffer.length, 0);
+    const header = buffer.toString("utf8", 0, bytesRead);
+    const newline = header.indexOf("\n");
+    return newline === -1 ? NaN : Number(header.slice(0, newline));
+  } catch {
+    return NaN;
+  } finally {
+    await handle?.close();
+  }
+}
@@ -0,0 +1,143 @@
+/**
+ * Concurrency helpers for running async work in parallel with a bound
+ */
+
+import { config } from "../config.js";
+
+/**
+ * Bounded FIFO queue for handing work from a producer to async consumers
+ * put() waits while the queue is full, get() waits while it is empty.
+ */
+export class AsyncQueue {
+  /**
+   * @param {number} maxSize - Maximum buffered items before put() waits
+   */
+  constructor(maxSize) {
+    this.maxSize = maxSize;
+    this.items = [];
+    this.closed = false;
+    this.getters = []; // Consumers waiting for an item
+    this.putters = []; // Producers waiting for space
+  }
+
+  /**
+   * Add an item, waiting for space if the queue is full
+   * @param {*} item
+   * @returns {Promise<void>}
+   */
+  async put(item) {
+    if (this.closed) {
+      throw new Error("Cannot put to a closed queue");
+    }
+
+    const getter = this.getters.shift();
+    if (getter) {
+      getter({ value: item, done: false });
+      return;
+    }
+
+    while (this.items.length >= this.maxSize) {
+      await new Promise((resolve) => this.putters.push(resolve));
+    }
+
+    this.items.push(item);
+  }
+
+  /**
+   * Take the next item, waiting if the queue is empty
+   * @returns {Promise<{value: *, done: boolean}>} - done is true once closed and drained
+   */
+  async get() {
+    if (this.items.length > 0) {
+      const value = this.items.shift();
+      this.putters.shift()?.();
+      return { value, done: false };
+    }
+
+    if (this.closed) {
+      return { value: undefined, done: true };
+    }
+
+    return new Promise((resolve) => this.getters.push(resolve));
+  }
+
+  /**
+   * Signal that no more items will be added
+   * Waiting consumers are released once the queue drains.
+   */
+  close() {
+    this.closed = true;
+
+    for (const getter of this.getters.splice(0)) {
+      getter({ value: undefined, done: true });
+    }
+  }
+
+  /**
+   * Iterate items until the queue is closed and drained
+   * Lets one stage's output queue be the source of another worker pool.
+   */
+  async *[Symbol.asyncIterator]() {
+    for (;;) {
+      const { value, done } = await this.get();
+      if (done) return;
+      yield value;
+    }
+  }
+}
+
+/**
+ * Process items from an (async) iterable with a fixed number of workers
+ * Items flow through a bounded queue, so memory stays constant no matter
+ * how many items the source yields, and the source is read while workers run.
+ *
+ * A worker error does not stop the pool: remaining items are still
+ * processed and the first error is rethrown at the end. Workers should
+ * handle expected per-item failures themselves.
+ *
+ * @param {Iterable|AsyncIterable} source - Items to process
+ * @param {Object} options
+ * @param {number} options.concurrency - Number of workers
+ * @param {number} [options.queueSize] - Max items buffered ahead of the workers
+ * @param {Function} worker - Async function called with each item
+ * @returns {Promise<void>}
+ */
+export async function runWorkerPool(source, { concurrency, queueSize = config.pipeline.queueSize }, worker) {
+  const queue = new AsyncQueue(queueSize);
+  let firstError = null;
+
+  const produce = async () => {
+    try {
+      for await (const item of source) {
+        await queue.put(item);
+      }
+    } finally {
+      queue.close();
+    }
+  };
+
+  const consume = async () => {
+    for (;;) {
+      const { value, done } = await queue.get();
+      if (done) return;
+
+      try {
+        await worker(value);
+      } catch (err) {
+        firstError = firstError || err;
+      }
+    }
+  };
+
+  // Let workers finish in-flight items even if the source fails
+  const workers = Array.from({ length: concurrency }, () => consume());
+  const [production] = await Promise.allSettled([produce(), ...workers]);
+
+  if (production.status === "rejected") {
+    throw production.reason;
+  }
+
+  if (firstError) {
+    throw firstError;
+  }
+}
@@ -0,0 +1,20 @@
+/**
+ * HTTP helpers shared by the API clients
+ */
+
+/**
+ * Read and discard a response body
+ * Node's fetch keeps connections alive and reuses them, but a connection
+ * only goes back to the pool once its body has been consumed. Call this
+ * on responses whose body is not needed (e.g., errors) so the next
+ * request can skip a new TCP/TLS handshake.
+ * @param {Response} response
+ * @returns {Promise<void>}
+ */
+export async function discardBody(response) {
+  try {
+    await response.arrayBuffer();
+  } catch {
+    // Connection is closed instead of reused
+  }
+}
@@ -12,14 +12,43 @@ const LOG_LEVELS = {
 let currentLevel = LOG_LEVELS.info;
 let logFile = null;
 
+// The log file keeps per-title detail that is too noisy for the console
+const fileLevel = LOG_LEVELS.debug;
+
+// Live progress line pinned below console output (TTY only)
+let statusLine = null;
+
 /**
- * Set the minimum log level
+ * Set the minimum console log level
+ * The log file always records debug and above.
  * @param {"debug"|"info"|"warn"|"error"} level
  */
 export function setLogLevel(level) {
   currentLevel = LOG_LEVELS[level] ?? LOG_LEVELS.info;
 }
 
+/**
+ * Show or replace the live status line on stderr
+ * Console log output is printed above it. No-op when stderr is not a TTY.
+ * @param {string} text
+ */
+export function setStatusLine(text) {
+  if (!process.stderr.isTTY) return;
+
+  statusLine = text;
+  process.stderr.write(`\r\x1b[K${text}`);
+}
+
+/**
+ * Leave the current status line on screen and move below it
+ */
+export function endStatusLine() {
+  if (statusLine === null) return;
+
+  statusLine = null;
+  process.stderr.write("\n");
+}
+
 /**
  * Initialize file logging for a pipeline run
  * @param {string} pipelineName - Name of the pipeline (e.g., "refresh", "enrichment")
@@ -42,8 +71,11 @@ export function initFileLogging(pipelineName) {
 
 /**
  * Close the log file
+ * Also ends the status line, since this marks the end of a run.
  */
 export function closeFileLogging() {
+  endStatusLine();
+
   if (logFile) {
     logFile.end();
     logFile = null;
@@ -57,24 +89,33 @@ export function closeFileLogging() {
  * @param {Object} [data]
  */
 function log(level, message, data = null) {
-  if (LOG_LEVELS[level] < currentLevel) return;
+  const toConsole = LOG_LEVELS[level] >= currentLevel;
+  const toFile = logFile && LOG_LEVELS[level] >= fileLevel;
+  if (!toConsole && !toFile) return;
 
   const timestamp = new Date().toISOString();
-  const prefix = `[${timestamp}] [${level.toUpperCase()}]`;
 
   // Console output
-  const consoleMsg = data ? `${prefix} ${message} ${JSON.stringify(data)}` : `${prefix} ${message}`;
-
-  if (level === "error") {
-    console.error(consoleMsg);
-  } else if (level === "warn") {
-    console.warn(consoleMsg);
-  } else {
-    console.log(consoleMsg);
+  if (toConsole) {
+    const prefix = `[${timestamp}] [${level.toUpperCase()}]`;
+    const consoleMsg = data ? `${prefix} ${message} ${JSON.stringify(data)}` : `${prefix} ${message}`;
+
+    // Clear the status line so the message doesn't run into it, then redraw it below
+    if (statusLine !== null) process.stderr.write("\r\x1b[K");
+
+    if (level === "error") {
+      console.error(consoleMsg);
+    } else if (level === "warn") {
+      console.warn(consoleMsg);
+    } else {
+      console.log(consoleMsg);
+    }
+
+    if (statusLine !== null) process.stderr.write(statusLine);
   }
 
-  // File output
-  if (logFile) {
+  // File output (buffered stream, doesn't block the event loop)
+  if (toFile) {
     const fileEntry = {
       timestamp,
       level,
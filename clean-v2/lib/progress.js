@@ -1,6 +1,11 @@
 import fs from "fs";
 import path from "path";
 import { config } from "../config.js";
+import { setStatusLine } from "./logger.js";
+
+// Minimum time between progress bar redraws
+const RENDER_INTERVAL_MS = 200;
+const BAR_WIDTH = 30;
 
 /**
  * Progress tracker for pipeline runs
@@ -20,6 +25,7 @@ export class ProgressTracker {
     this.totalItems = 0;
     this.processedIds = new Set();
     this.lastCheckpoint = null;
+    this.lastRender = 0;
   }
 
   /**
@@ -39,6 +45,7 @@ export class ProgressTracker {
     this.success++;
     this.processedIds.add(id);
     this.maybeSaveCheckpoint();
+    this.renderBar();
   }
 
   /**
@@ -50,6 +57,7 @@ export class ProgressTracker {
     this.failed++;
     this.processedIds.add(id);
     this.maybeSaveCheckpoint();
+    this.renderBar();
   }
 
   /**
@@ -61,6 +69,7 @@ export class ProgressTracker {
     this.skipped++;
     this.processedIds.add(id);
     this.maybeSaveCheckpoint();
+    this.renderBar();
   }
 
   /**
@@ -185,16 +194,48 @@ export class ProgressTracker {
   }
 
   /**
-   * Print progress to console
+   * Format the progress counters as one line
+   * @returns {string}
    */
-  printProgress() {
+  formatProgress() {
     const summary = this.getSummary();
     const eta = summary.estimatedTimeRemaining ? ` | ETA: ${summary.estimatedTimeRemaining}` : "";
-    console.log(
-      `Progress: ${summary.processed}/${summary.total} (${summary.progressPercent}%) | ` +
-        `Success: ${summary.success} | Failed: ${summary.failed} | Skipped: ${summary.skipped}${eta}`
+    return (
+      `${summary.processed}/${summary.total} (${summary.progressPercent}%) | ` +
+      `Success: ${summary.success} | Failed: ${summary.failed} | Skipped: ${summary.skipped}${eta}`
     );
   }
+
+  /**
+   * Redraw the live progress bar (TTY only), at most every RENDER_INTERVAL_MS
+   * @param {boolean} [force=false] - Redraw even if the interval hasn't passed
+   */
+  renderBar(force = false) {
+    if (!process.stderr.isTTY) return;
+
+    const now = Date.now();
+    if (!force && now - this.lastRender < RENDER_INTERVAL_MS) return;
+    this.lastRender = now;
+
+    const ratio = this.totalItems > 0 ? Math.min(this.processed / this.totalItems, 1) : 0;
+    const filled = Math.round(ratio * BAR_WIDTH);
+    const bar = "#".repeat(filled) + "-".repeat(BAR_WIDTH - filled);
+
+    setStatusLine(`[${bar}] ${this.formatProgress()}`);
+  }
+
+  /**
+   * Print progress to console
+   * On a TTY this updates the progress bar in place instead of adding a line.
+   */
+  printProgress() {
+    if (process.stderr.isTTY) {
+      this.renderBar(true);
+      return;
+    }
+
+    console.log(`Progress: ${this.formatProgress()}`);
+  }
 }
 
 /**
@@ -1,3 +1,5 @@
+import { config } from "../config.js";
+
 /**
  * Simple rate limiter using delay between requests
  */
@@ -12,18 +14,25 @@ export class RateLimiter {
 
   /**
    * Wait until we're allowed to make another request
-   * Call this before each request
+   * Call this before each request. Safe to call concurrently: each caller
+   * reserves the next free slot before sleeping.
    */
   async acquire() {
     const now = Date.now();
-    const elapsed = now - this.lastRequest;
-    const waitTime = Math.max(0, this.delayMs - elapsed);
+    const slot = Math.max(now, this.lastRequest + this.delayMs);
+    this.lastRequest = slot;
 
-    if (waitTime > 0) {
-      await sleep(waitTime);
+    if (slot > now) {
+      await sleep(slot - now);
     }
+  }
 
-    this.lastRequest = Date.now();
+  /**
+   * Hold off all callers for a while (e.g. after a 429 with Retry-After)
+   * @param {number} ms - How long to pause from now
+   */
+  pause(ms) {
+    this.lastRequest = Math.max(this.lastRequest, Date.now() + ms - this.delayMs);
   }
 
   /**
@@ -35,6 +44,67 @@ export class RateLimiter {
   }
 }
 
+/**
+ * Token bucket rate limiter
+ * Allows bursts up to `capacity` and refills at a steady `refillRate`,
+ * so time spent waiting on a slow response counts toward the next request
+ */
+export class TokenBucket {
+  /**
+   * @param {number} capacity - Maximum tokens (burst size)
+   * @param {number} refillRate - Tokens added per second
+   */
+  constructor(capacity, refillRate) {
+    this.capacity = capacity;
+    this.refillRate = refillRate;
+    this.tokens = capacity;
+    this.lastRefill = Date.now();
+  }
+
+  /**
+   * Add tokens earned since the last refill
+   * Nothing is earned while paused (lastRefill is in the future).
+   */
+  refill() {
+    const now = Date.now();
+    if (now <= this.lastRefill) return;
+
+    const elapsed = (now - this.lastRefill) / 1000;
+    this.tokens = Math.min(this.capacity, this.tokens + elapsed * this.refillRate);
+    this.lastRefill = now;
+  }
+
+  /**
+   * Take tokens, waiting until they are available
+   * Concurrent callers take tokens immediately (the balance may go negative)
+   * and each sleeps off its own share of the debt, so waiters are served in order.
+   * @param {number} [n=1] - Number of tokens to take
+   */
+  async acquire(n = 1) {
+    this.refill();
+    this.tokens -= n;
+
+    const pausedFor = Math.max(0, this.lastRefill - Date.now());
+    const owed = this.tokens < 0 ? (-this.tokens / this.refillRate) * 1000 : 0;
+
+    if (pausedFor + owed > 0) {
+      await sleep(pausedFor + owed);
+    }
+  }
+
+  /**
+   * Hold off all callers for a while (e.g. after a 429 with Retry-After)
+   * Empties the bucket and stops refilling until the pause ends, so the
+   * pool resumes at the steady rate instead of bursting.
+   * @param {number} ms - How long to pause from now
+   */
+  pause(ms) {
+    this.refill();
+    this.tokens = Math.min(this.tokens, 0);
+    this.lastRefill = Math.max(this.lastRefill, Date.now() + ms);
+  }
+}
+
 /**
  * Sleep for a given number of milliseconds
  * @param {number} ms - Milliseconds to sleep
@@ -46,11 +116,15 @@ export function sleep(ms) {
 
 /**
  * Create a rate limiter for TMDB API
- * @param {number} [delayMs=500] - Delay between requests
- * @returns {RateLimiter}
+ * @param {number} [capacity] - Burst size (defaults to config)
+ * @param {number} [refillRate] - Requests per second (defaults to config)
+ * @returns {TokenBucket}
  */
-export function createTMDBRateLimiter(delayMs = 500) {
-  return new RateLimiter(delayMs);
+export function createTMDBRateLimiter(
+  capacity = config.tmdb.rateLimit.capacity,
+  refillRate = config.tmdb.rateLimit.refillRate
+) {
+  return new TokenBucket(capacity, refillRate);
 }
 
 /**
@@ -64,9 +138,10 @@ export function createWikipediaRateLimiter(delayMs = 200) {
 
 /**
  * Create a rate limiter for OpenAI API
- * @param {number} [delayMs=100] - Delay between requests
- * @returns {RateLimiter}
+ * Sustains one request per `delayMs` on average, with bursts up to config capacity
+ * @param {number} [delayMs=100] - Average delay between requests
+ * @returns {TokenBucket}
  */
 export function createOpenAIRateLimiter(delayMs = 100) {
-  return new RateLimiter(delayMs);
+  return new TokenBucket(config.openai.rateLimit.capacity, 1000 / delayMs);
 }
@@ -1,7 +1,22 @@
 import { sleep } from "./rate-limiter.js";
 
+// Network error codes worth retrying (Node and undici/fetch)
+const RETRYABLE_CODES = new Set([
+  "ECONNRESET",
+  "ETIMEDOUT",
+  "ECONNABORTED",
+  "ECONNREFUSED",
+  "EPIPE",
+  "EAI_AGAIN",
+  "UND_ERR_SOCKET",
+  "UND_ERR_CONNECT_TIMEOUT",
+  "UND_ERR_HEADERS_TIMEOUT",
+  "UND_ERR_BODY_TIMEOUT",
+]);
+
 /**
- * Retry a function with exponential backoff
+ * Retry a function with exponential backoff and jitter
+ * Honors Retry-After on the error's response when present
  * @param {Function} fn - Async function to retry
  * @param {Object} options
  * @param {number} [options.maxRetries=3] - Maximum number of retries
@@ -34,9 +49,10 @@ export async function retry(fn, options = {}) {
         throw error;
       }
 
-      // Handle rate limit responses
+      // Handle rate limit responses; otherwise add jitter so concurrent
+      // callers that failed together don't all retry at the same instant
       const retryAfter = getRetryAfter(error);
-      const waitTime = retryAfter || delay;
+      const waitTime = retryAfter ?? Math.round(delay + Math.random() * initialDelay);
 
       onRetry(error, attempt + 1, waitTime);
 
@@ -56,8 +72,13 @@ export async function retry(fn, options = {}) {
  * @returns {boolean}
  */
 function defaultShouldRetry(error) {
-  // Network errors
-  if (error.code === "ECONNRESET" || error.code === "ETIMEDOUT" || error.code === "ECONNABORTED") {
+  // Network errors (fetch wraps them as TypeError with the code on `cause`)
+  if (RETRYABLE_CODES.has(error.code) || RETRYABLE_CODES.has(error.cause?.code)) {
+    return true;
+  }
+
+  // Request timed out (AbortSignal.timeout)
+  if (error.name === "TimeoutError") {
     return true;
   }
 
@@ -82,7 +103,9 @@ function defaultShouldRetry(error) {
  * @returns {number|null} - Delay in ms, or null if not present
  */
 function getRetryAfter(error) {
-  const retryAfter = error.response?.headers?.["retry-after"];
+  const headers = error.response?.headers;
+  // fetch responses carry a Headers instance; other clients use plain objects
+  const retryAfter = typeof headers?.get === "function" ? headers.get("retry-after") : headers?.["retry-after"];
 
   if (!retryAfter) return null;
 
@@ -1,5 +1,8 @@
 import { createClient } from "@supabase/supabase-js";
-import { getSupabaseUrl, getSupabaseKey } from "../config.js";
+import { config, getSupabaseUrl, getSupabaseKey } from "../config.js";
+import { createLogger } from "./logger.js";
+
+const log = createLogger("[Supabase]");
 
 let client = null;
 
@@ -119,6 +122,99 @@ export async function fetchTitles({ limit, offset = 0, kind, ids, needsEnrichmen
   return allResults;
 }
 
+/**
+ * Parse a --min-popularity argument
+ * @param {string} value - Raw CLI value
+ * @returns {number}
+ * @throws {Error} If the value is not a non-negative number
+ */
+export function parseMinPopularity(value) {
+  const minPopularity = Number(value);
+  if (value === undefined || value.trim() === "" || !Number.isFinite(minPopularity) || minPopularity < 0) {
+    throw new Error(`--min-popularity must be a non-negative number, got: ${value}`);
+  }
+  return minPopularity;
+}
+
+/**
+ * Filter a titles query to popularity above a threshold
+ * A missing or zero threshold means no filter, so titles with zero or
+ * null popularity are kept.
+ * @param {Object} query - Supabase query builder
+ * @param {number} [minPopularity]
+ * @returns {Object} - The (possibly filtered) query
+ */
+export function filterMinPopularity(query, minPopularity) {
+  if (Number.isFinite(minPopularity) && minPopularity > 0) {
+    return query.gt("popularity", minPopularity);
+  }
+  return query;
+}
+
+/**
+ * Stream titles page by page
+ * Yields rows as each page arrives, so callers can start working on the
+ * first page while later pages are still being fetched.
+ * Pages are keyed on id (id > last seen id) rather than offsets, so rows
+ * never get skipped or repeated when callers update a filtered column
+ * (e.g. popularity) while iterating.
+ * @param {Object} options
+ * @param {string} [options.columns="*"] - Columns to select (must include id)
+ * @param {number} [options.pageSize=500] - Rows per request
+ * @param {number} [options.limit] - Max titles to yield (no limit if not specified)
+ * @param {number} [options.offset=0] - Rows to skip (applied to the first page only)
+ * @param {string} [options.kind] - Filter by 'movie' or 'tv'
+ * @param {number} [options.minPopularity] - Only titles with popularity above this (0 = no filter)
+ * @returns {AsyncGenerator<Object>}
+ */
+export async function* iterateTitles({ columns = "*", pageSize = 500, limit, offset = 0, kind, minPopularity } = {}) {
+  const supabase = getSupabase();
+  const targetCount = limit || Infinity;
+  let lastId = null;
+  let yielded = 0;
+
+  while (yielded < targetCount) {
+    const batchSize = Math.min(pageSize, targetCount - yielded);
+
+    let query = supabase.from("titles").select(columns);
+
+    if (kind) {
+      query = query.eq("kind", kind);
+    }
+
+    query = filterMinPopularity(query, minPopularity);
+    query = query.order("id", { ascending: true });
+
+    if (lastId === null) {
+      query = query.range(offset, offset + batchSize - 1);
+    } else {
+      query = query.gt("id", lastId).limit(batchSize);
+    }
+
+    const { data, error } = await query;
+
+    if (error) {
+      throw new Error(`Failed to fetch titles: ${error.message}`);
+    }
+
+    if (!data || data.length === 0) {
+      break; // No more results
+    }
+
+    for (const row of data) {
+      yield row;
+    }
+
+    yielded += data.length;
+    lastId = data[data.length - 1].id;
+
+    // If we got fewer results than requested, we've reached the end
+    if (data.length < batchSize) {
+      break;
+    }
+  }
+}
+
 /**
  * Separate embedding fields from other updates
  * @param {Object} updates
@@ -195,15 +291,122 @@ export async function batchUpdateTitles(batch) {
   return { success, failed };
 }
 
+/**
+ * Buffers title updates and writes them with one batch_update_titles RPC
+ * per batch instead of one UPDATE round-trip per title
+ * (see migrations/20251218_batch_update_titles.sql).
+ *
+ * Rows must include `id`. The RPC only updates existing titles: a row whose
+ * title was deleted in the meantime is reported as failed, never re-inserted.
+ * Only the columns present in a row are written; rows are grouped by
+ * column set so one row's columns never overwrite another's with nulls.
+ * Do not buffer embedding columns - use updateTitle() for those.
+ */
+export class UpdateBuffer {
+  /**
+   * @param {Object} options
+   * @param {number} [options.flushEvery] - Rows per batch update (defaults to config)
+   * @param {Function} [options.onFlush] - Called with {succeeded: id[], failed: id[]} after each flush
+   */
+  constructor({ flushEvery = config.pipeline.updateBatchSize, onFlush = () => {} } = {}) {
+    this.flushEvery = flushEvery;
+    this.onFlush = onFlush;
+    this.rows = [];
+  }
+
+  /**
+   * Add a row, flushing if the buffer is full
+   * @param {Object} row - Row with `id` and the columns to update
+   * @returns {Promise<void>}
+   */
+  async add(row) {
+    this.rows.push(row);
+
+    if (this.rows.length >= this.flushEvery) {
+      await this.flush();
+    }
+  }
+
+  /**
+   * Write all buffered rows
+   * Falls back to per-row updates for a group if its batch update fails,
+   * so one bad row does not fail the whole batch
+   * @returns {Promise<{succeeded: Array, failed: Array}>}
+   */
+  async flush() {
+    // Take ownership before awaiting so concurrent add() calls start a new batch
+    const rows = this.rows;
+    this.rows = [];
+
+    const result = { succeeded: [], failed: [] };
+    if (rows.length === 0) return result;
+
+    const supabase = getSupabase();
+
+    for (const group of groupByColumns(rows)) {
+      const { data, error } = await supabase.rpc("batch_update_titles", { rows: group });
+
+      if (!error) {
+        // Ids missing from the result no longer exist in the table
+        const updated = new Set(data || []);
+        for (const { id } of group) {
+          if (updated.has(id)) {
+            result.succeeded.push(id);
+          } else {
+            log.warn(`Title ${id} not found, skipping update`);
+            result.failed.push(id);
+          }
+        }
+        continue;
+      }
+
+      log.warn(`Batch update of ${group.length} rows failed, retrying row by row`, {
+        error: error.message,
+      });
+
+      for (const { id, ...updates } of group) {
+        try {
+          await updateTitle(id, updates);
+          result.succeeded.push(id);
+        } catch (err) {
+          log.error(`Failed to update title ${id}`, { error: err.message });
+          result.failed.push(id);
+        }
+      }
+    }
+
+    this.onFlush(result);
+    return result;
+  }
+}
+
+/**
+ * Group rows that share the same set of columns
+ * @param {Array<Object>} rows
+ * @returns {Array<Array<Object>>}
+ */
+function groupByColumns(rows) {
+  const groups = new Map();
+
+  for (const row of rows) {
+    const key = Object.keys(row).sort().join(",");
+    if (!groups.has(key)) groups.set(key, []);
+    groups.get(key).push(row);
+  }
+
+  return [...groups.values()];
+}
+
 /**
  * Get total count of titles matching filters
  * @param {Object} options
  * @param {string} [options.kind] - Filter by 'movie' or 'tv'
  * @param {boolean} [options.needsEnrichment] - Filter titles needing enrichment (vibes/embeddings null)
  * @param {boolean} [options.notEnriched] - Filter titles where enrichment_status != 'enriched'
+ * @param {number} [options.minPopularity] - Only titles with popularity above this (0 = no filter)
  * @returns {Promise<number>}
  */
-export async function getTitleCount({ kind, needsEnrichment, notEnriched } = {}) {
+export async function getTitleCount({ kind, needsEnrichment, notEnriched, minPopularity } = {}) {
   const supabase = getSupabase();
 
   let query = supabase.from("titles").select("id", { count: "exact", head: true });
@@ -220,6 +423,8 @@ export async function getTitleCount({ kind, needsEnrichment, notEnriched } = {})
     query = query.or("enrichment_status.is.null,enrichment_status.neq.enriched");
   }
 
+  query = filterMinPopularity(query, minPopularity);
+
   const { count, error } = await query;
 
   if (error) {
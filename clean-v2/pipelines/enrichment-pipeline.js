@@ -4,14 +4,26 @@
  * Supports streaming pagination for 50k+ titles
  */
 
-import { getSupabase, updateTitle, getTitleCount } from "../lib/supabase.js";
+import { config } from "../config.js";
+import {
+  getSupabase,
+  updateTitle,
+  getTitleCount,
+  filterMinPopularity,
+  parseMinPopularity,
+} from "../lib/supabase.js";
 import { createWikipediaRateLimiter, createOpenAIRateLimiter } from "../lib/rate-limiter.js";
 import { ProgressTracker } from "../lib/progress.js";
+import { runWorkerPool } from "../lib/concurrency.js";
 import { initFileLogging, closeFileLogging, info, error, warn, debug } from "../lib/logger.js";
 import { createWikipediaFetcher } from "../wikipedia/fetcher.js";
 import { fetchWikipediaContent } from "../wikipedia/content-fetcher.js";
 import { extractVibes, extractVibesFromOverview } from "../enrichment/vibe-extractor.js";
-import { extractThemes, extractThemesFromOverview } from "../enrichment/theme-extractor.js";
+import {
+  extractThemes,
+  extractThemesFromOverview,
+  setThemeCacheEnabled,
+} from "../enrichment/theme-extractor.js";
 import { generateProfile, generateProfileFromOverview } from "../enrichment/profile-generator.js";
 import { extractSlots, extractSlotsFromOverview } from "../enrichment/slot-extractor.js";
 import { generateEmbeddingsForTitle } from "../embeddings/generator.js";
@@ -42,6 +54,8 @@ function parseArgs() {
     embeddingsOnly: false, // Only regenerate embeddings, skip LLM extraction
     sparseVibesOnly: false, // Only re-enrich titles with < 32 vibes
     reEnrichMissing: false, // Re-enrich titles missing any fields
+    minPopularity: null, // Only titles with popularity above this
+    noCache: false, // Ignore themes cached by earlier runs
   };
 
   for (let i = 0; i < args.length; i++) {
@@ -70,6 +84,10 @@ function parseArgs() {
     } else if (arg === "--re-enrich-missing") {
       options.reEnrichMissing = true;
       options.all = true;
+    } else if (arg === "--min-popularity" && args[i + 1]) {
+      options.minPopularity = parseMinPopularity(args[++i]);
+    } else if (arg === "--no-cache") {
+      options.noCache = true;
     } else if (arg === "--help" || arg === "-h") {
       printUsage();
       process.exit(0);
@@ -98,6 +116,8 @@ Options:
   --tv-only            Only process TV shows
   --sparse-vibes-only  Only re-enrich titles with < 32 vibes
   --re-enrich-missing  Re-enrich titles missing vibes/themes/profile/slots
+  --min-popularity <n> Only process titles with popularity above n (0 = all)
+  --no-cache           Regenerate themes instead of reusing cached results
   --help, -h           Show this help
 
 Examples:
@@ -139,6 +159,8 @@ async function fetchTitleBatch(options, offset, batchSize) {
     query = query.eq("kind", options.kind);
   }
 
+  query = filterMinPopularity(query, options.minPopularity);
+
   // Default: only non-enriched (unless --all, --sparse-vibes-only, or --re-enrich-missing)
   if (!options.all) {
     query = query.or("enrichment_status.is.null,enrichment_status.neq.enriched");
@@ -186,41 +208,21 @@ function filterTitlesForEnrichment(titles, options) {
 }
 
 /**
- * Run the enrichment pipeline with streaming pagination
+ * Stream titles to enrich (streaming pagination)
+ * Fetches pages lazily, applies the mode filter, and skips titles
+ * already processed in a resumed run
+ * @param {Object} options - Parsed CLI options
+ * @param {ProgressTracker} progress
+ * @returns {AsyncGenerator<Object>}
  */
-async function run() {
-  const options = parseArgs();
-
-  initFileLogging("enrichment");
-  info("Starting enrichment pipeline", options);
-
-  const progress = new ProgressTracker("enrichment");
-
-  // Load checkpoint if resuming
-  if (options.resume) {
-    if (progress.loadCheckpoint()) {
-      info(`Resuming from checkpoint: ${progress.processed} already processed`);
-    }
-  }
-
-  // Get total count for progress tracking
-  const totalCount = await getTitleCount({ kind: options.kind, notEnriched: !options.all });
-  const targetCount = options.limit || totalCount - options.offset;
-  info(`Found ${totalCount} titles total, targeting up to ${targetCount} titles`);
-
-  // Create rate limiters
-  const wikiRateLimiter = createWikipediaRateLimiter();
-  const openaiRateLimiter = createOpenAIRateLimiter(150); // 150ms between OpenAI calls
-  const wikipedia = createWikipediaFetcher(wikiRateLimiter);
-
-  // Streaming pagination: fetch and process in batches
+async function* iterateEnrichmentCandidates(options, progress) {
   let currentOffset = options.offset;
-  let totalProcessed = 0;
+  let totalYielded = 0;
   const maxToProcess = options.limit || Infinity;
 
-  while (totalProcessed < maxToProcess) {
+  while (totalYielded < maxToProcess) {
     // Fetch next batch
-    const batchSize = Math.min(SUPABASE_PAGE_SIZE, maxToProcess - totalProcessed);
+    const batchSize = Math.min(SUPABASE_PAGE_SIZE, maxToProcess - totalYielded);
     const batch = await fetchTitleBatch(options, currentOffset, batchSize);
 
     if (batch.length === 0) {
@@ -228,79 +230,100 @@ async function run() {
       break;
     }
 
+    // Move to next batch
+    currentOffset += batch.length;
+
     // Filter based on mode (sparse vibes, missing fields, etc.)
     const titlesToProcess = filterTitlesForEnrichment(batch, options);
 
-    if (titlesToProcess.length === 0 && batch.length > 0) {
+    if (titlesToProcess.length === 0) {
       // All titles in batch were filtered out, move to next batch
-      currentOffset += batch.length;
       continue;
     }
 
-    info(`Fetched batch of ${batch.length}, processing ${titlesToProcess.length} after filtering`);
+    debug(`Fetched batch of ${batch.length}, processing ${titlesToProcess.length} after filtering`);
     progress.setTotal(progress.totalItems + titlesToProcess.length);
 
-    // Process each title in batch
     for (const title of titlesToProcess) {
-      if (totalProcessed >= maxToProcess) break;
+      if (totalYielded >= maxToProcess) break;
 
       // Skip if already processed (resume mode)
       if (progress.isProcessed(title.id)) {
         continue;
       }
 
-      const errors = [];
-      const updates = {};
+      yield title;
+      totalYielded++;
+    }
 
-      try {
-        info(`Enriching: ${title.title} (${title.id})`);
-
-        // Run diagnosis to see what's needed (for re-enrich modes)
-        const diagnosis = diagnoseEnrichmentNeeds(title);
-        const needsVibes = !title.vibes || hasSparseVibes(title.vibes) || diagnosis.missing.includes("vibes");
-        const needsThemes = !title.themes || title.themes.length === 0;
-        const needsProfile = !title.profile_string;
-        const needsSlots = !title.slots;
-
-        const year = getYear(title.release_date);
-        let content = null;
-
-        // Skip LLM extraction steps if --embeddings-only mode
-        if (!options.embeddingsOnly) {
-          // Step 1: Fetch Wikipedia content with validation
-          if (!title.wiki_source_url) {
-            try {
-              const wikiResult = await wikipedia.fetchForTitle(
-                title.title,
-                year,
-                title.kind,
-                {
-                  director: title.director,
-                  cast: title.cast,
-                }
-              );
-
-              if (wikiResult) {
-                content = wikiResult.content;
-                updates.wiki_source_url = wikiResult.url;
-                debug(`Wikipedia found (confidence: ${wikiResult.confidence})`);
-              } else {
-                debug("No valid Wikipedia article found, using overview only");
-                updates.wiki_source_url = null;
-              }
-            } catch (err) {
-              errors.push(`wiki: ${err.message}`);
-              warn(`Wikipedia error for ${title.title}: ${err.message}`);
-            }
-          } else if (title.wiki_source_url) {
-            // Fetch existing wiki content for LLM extraction
-            try {
-              content = await fetchWikipediaContent(title.wiki_source_url, wikiRateLimiter);
-            } catch (err) {
-              debug(`Failed to fetch existing wiki content: ${err.message}`);
+    // Save checkpoint after each batch
+    progress.saveCheckpoint();
+  }
+}
+
+/**
+ * Enrich a single title and write the results
+ * @param {Object} title
+ * @param {Object} options - Parsed CLI options
+ * @param {Object} clients - { wikipedia, wikiRateLimiter, openaiRateLimiter }
+ * @param {ProgressTracker} progress
+ */
+async function enrichTitle(title, options, { wikipedia, wikiRateLimiter, openaiRateLimiter }, progress) {
+  const errors = [];
+  const updates = {};
+
+  try {
+    debug(`Enriching: ${title.title} (${title.id})`);
+
+    // Run diagnosis to see what's needed (for re-enrich modes)
+    const diagnosis = diagnoseEnrichmentNeeds(title);
+    const needsVibes = !title.vibes || hasSparseVibes(title.vibes) || diagnosis.missing.includes("vibes");
+    const needsThemes = !title.themes || title.themes.length === 0;
+    const needsProfile = !title.profile_string;
+    const needsSlots = !title.slots;
+
+    const year = getYear(title.release_date);
+    let content = null;
+
+    // Skip LLM extraction steps if --embeddings-only mode
+    if (!options.embeddingsOnly) {
+      // Step 1: Fetch Wikipedia content with validation
+      if (!title.wiki_source_url) {
+        try {
+          const wikiResult = await wikipedia.fetchForTitle(
+            title.title,
+            year,
+            title.kind,
+            {
+              director: title.director,
+              cast: title.cast,
             }
+          );
+
+          if (wikiResult) {
+            content = wikiResult.content;
+            updates.wiki_source_url = wikiResult.url;
+            debug(`Wikipedia found (confidence: ${wikiResult.confidence})`);
+          } else {
+            debug("No valid Wikipedia article found, using overview only");
+            updates.wiki_source_url = null;
           }
+        } catch (err) {
+          errors.push(`wiki: ${err.message}`);
+          warn(`Wikipedia error for ${title.title}: ${err.message}`);
+        }
+      } else if (title.wiki_source_url) {
+        // Fetch existing wiki content for LLM extraction
+        try {
+          content = await fetchWikipediaContent(title.wiki_source_url, wikiRateLimiter);
+        } catch (err) {
+          debug(`Failed to fetch existing wiki content: ${err.message}`);
+        }
+      }
 
+      // Steps 2-5 are independent LLM calls, so run them concurrently
+      await Promise.all([
+        (async () => {
           // Step 2: Extract vibes, tone, pacing (if needed or sparse)
           if (needsVibes || !title.tone || !title.pacing) {
             try {
@@ -332,7 +355,8 @@ async function run() {
               warn(`Vibes extraction error for ${title.title}: ${err.message}`);
             }
           }
-
+        })(),
+        (async () => {
           // Step 3: Extract themes (if needed)
           if (needsThemes) {
             try {
@@ -352,7 +376,8 @@ async function run() {
               warn(`Themes extraction error for ${title.title}: ${err.message}`);
             }
           }
-
+        })(),
+        (async () => {
           // Step 4: Generate profile string (if needed)
           if (needsProfile) {
             try {
@@ -372,7 +397,8 @@ async function run() {
               warn(`Profile generation error for ${title.title}: ${err.message}`);
             }
           }
-
+        })(),
+        (async () => {
           // Step 5: Extract slots (if needed)
           if (needsSlots) {
             try {
@@ -392,105 +418,142 @@ async function run() {
               warn(`Slots extraction error for ${title.title}: ${err.message}`);
             }
           }
-        } // End of LLM extraction steps
+        })(),
+      ]);
+    } // End of LLM extraction steps
+
+    // Step 6: Generate embeddings (unless --skip-embeddings)
+    // Always regenerate when enrichment data changes or in embeddings-only mode
+    if (!options.skipEmbeddings) {
+      const enrichmentChanged = updates.vibes || updates.tone || updates.pacing ||
+        updates.themes || updates.profile_string || updates.wiki_source_url;
+
+      // In embeddings-only mode, always regenerate; otherwise check if needed
+      const shouldGenerateEmbeddings = options.embeddingsOnly ||
+        enrichmentChanged ||
+        diagnosis.missing.some((f) => f.includes("embedding"));
+
+      if (shouldGenerateEmbeddings) {
+        try {
+          const enrichedTitle = { ...title, ...updates };
+          const embeddings = await generateEmbeddingsForTitle(enrichedTitle);
+
+          if (embeddings.vibe) {
+            updates.vibe_embedding = embeddings.vibe;
+          }
+          if (embeddings.content) {
+            updates.content_embedding = embeddings.content;
+          }
+          if (embeddings.metadata) {
+            updates.metadata_embedding = embeddings.metadata;
+          }
+        } catch (err) {
+          errors.push(`embeddings: ${err.message}`);
+          warn(`Embedding generation error for ${title.title}: ${err.message}`);
+        }
+      }
+    }
 
-        // Step 6: Generate embeddings (unless --skip-embeddings)
-        // Always regenerate when enrichment data changes or in embeddings-only mode
-        if (!options.skipEmbeddings) {
-          const enrichmentChanged = updates.vibes || updates.tone || updates.pacing ||
-            updates.themes || updates.profile_string || updates.wiki_source_url;
+    // Step 7: Determine status and update database
+    if (errors.length === 0) {
+      updates.enrichment_status = "enriched";
+    } else if (Object.keys(updates).length > 1) {
+      // Some fields succeeded
+      updates.enrichment_status = "enriched";
+      warn(`Partial enrichment for ${title.title}: ${errors.join("; ")}`);
+    } else {
+      updates.enrichment_status = "failed";
+      error(`Failed enrichment for ${title.title}: ${errors.join("; ")}`);
+    }
 
-          // In embeddings-only mode, always regenerate; otherwise check if needed
-          const shouldGenerateEmbeddings = options.embeddingsOnly ||
-            enrichmentChanged ||
-            diagnosis.missing.some((f) => f.includes("embedding"));
+    updates.enriched_at = new Date().toISOString();
+
+    // Handle needs_enrichment flag
+    const enrichmentDataChanged = updates.vibes || updates.themes || updates.profile_string || updates.tone || updates.pacing;
+    const embeddingsGenerated = updates.vibe_embedding || updates.content_embedding || updates.metadata_embedding;
+
+    if (options.embeddingsOnly && embeddingsGenerated) {
+      // Embeddings-only mode: clear flag since we just regenerated embeddings
+      updates.needs_enrichment = false;
+    } else if (enrichmentDataChanged) {
+      if (options.skipEmbeddings) {
+        // Signal that embeddings need to be regenerated later
+        updates.needs_enrichment = true;
+      } else if (embeddingsGenerated) {
+        // Embeddings were regenerated, clear the flag
+        updates.needs_enrichment = false;
+      }
+    }
 
-          if (shouldGenerateEmbeddings) {
-            try {
-              const enrichedTitle = { ...title, ...updates };
-              const embeddings = await generateEmbeddingsForTitle(enrichedTitle);
+    await updateTitle(title.id, updates);
 
-              if (embeddings.vibe) {
-                updates.vibe_embedding = embeddings.vibe;
-              }
-              if (embeddings.content) {
-                updates.content_embedding = embeddings.content;
-              }
-              if (embeddings.metadata) {
-                updates.metadata_embedding = embeddings.metadata;
-              }
-            } catch (err) {
-              errors.push(`embeddings: ${err.message}`);
-              warn(`Embedding generation error for ${title.title}: ${err.message}`);
-            }
-          }
-        }
+    progress.recordSuccess(title.id);
 
-        // Step 7: Determine status and update database
-        if (errors.length === 0) {
-          updates.enrichment_status = "enriched";
-        } else if (Object.keys(updates).length > 1) {
-          // Some fields succeeded
-          updates.enrichment_status = "enriched";
-          warn(`Partial enrichment for ${title.title}: ${errors.join("; ")}`);
-        } else {
-          updates.enrichment_status = "failed";
-          error(`Failed enrichment for ${title.title}: ${errors.join("; ")}`);
-        }
+    // Print progress every 50 items
+    if (progress.processed % 50 === 0) {
+      progress.printProgress();
+    }
+  } catch (err) {
+    error(`Error enriching ${title.title} (${title.id})`, { error: err.message });
 
+    // Try to save partial progress if any updates were made
+    if (Object.keys(updates).length > 0) {
+      try {
+        updates.enrichment_status = "failed";
         updates.enriched_at = new Date().toISOString();
+        await updateTitle(title.id, updates);
+      } catch (updateErr) {
+        error(`Failed to save partial updates for ${title.id}`, { error: updateErr.message });
+      }
+    }
 
-        // Handle needs_enrichment flag
-        const enrichmentDataChanged = updates.vibes || updates.themes || updates.profile_string || updates.tone || updates.pacing;
-        const embeddingsGenerated = updates.vibe_embedding || updates.content_embedding || updates.metadata_embedding;
-
-        if (options.embeddingsOnly && embeddingsGenerated) {
-          // Embeddings-only mode: clear flag since we just regenerated embeddings
-          updates.needs_enrichment = false;
-        } else if (enrichmentDataChanged) {
-          if (options.skipEmbeddings) {
-            // Signal that embeddings need to be regenerated later
-            updates.needs_enrichment = true;
-          } else if (embeddingsGenerated) {
-            // Embeddings were regenerated, clear the flag
-            updates.needs_enrichment = false;
-          }
-        }
+    progress.recordFailure(title.id);
+  }
+}
 
-        await updateTitle(title.id, updates);
+/**
+ * Run the enrichment pipeline with streaming pagination
+ */
+async function run() {
+  const options = parseArgs();
 
-        progress.recordSuccess(title.id);
-        totalProcessed++;
+  initFileLogging("enrichment");
+  info("Starting enrichment pipeline", options);
 
-        // Print progress every 50 items
-        if (progress.processed % 50 === 0) {
-          progress.printProgress();
-        }
-      } catch (err) {
-        error(`Error enriching ${title.title} (${title.id})`, { error: err.message });
-
-        // Try to save partial progress if any updates were made
-        if (Object.keys(updates).length > 0) {
-          try {
-            updates.enrichment_status = "failed";
-            updates.enriched_at = new Date().toISOString();
-            await updateTitle(title.id, updates);
-          } catch (updateErr) {
-            error(`Failed to save partial updates for ${title.id}`, { error: updateErr.message });
-          }
-        }
+  setThemeCacheEnabled(!options.noCache);
 
-        progress.recordFailure(title.id);
-        totalProcessed++;
-      }
+  const progress = new ProgressTracker("enrichment");
+
+  // Load checkpoint if resuming
+  if (options.resume) {
+    if (progress.loadCheckpoint()) {
+      info(`Resuming from checkpoint: ${progress.processed} already processed`);
     }
+  }
 
-    // Move to next batch
-    currentOffset += batch.length;
+  // Get total count for progress tracking
+  const totalCount = await getTitleCount({
+    kind: options.kind,
+    notEnriched: !options.all,
+    minPopularity: options.minPopularity,
+  });
+  const targetCount = options.limit || totalCount - options.offset;
+  info(`Found ${totalCount} titles total, targeting up to ${targetCount} titles`);
 
-    // Save checkpoint after each batch
-    progress.saveCheckpoint();
-  }
+  // Create rate limiters
+  const wikiRateLimiter = createWikipediaRateLimiter();
+  const openaiRateLimiter = createOpenAIRateLimiter(150); // 150ms between OpenAI calls
+  const wikipedia = createWikipediaFetcher(wikiRateLimiter);
+  const clients = { wikipedia, wikiRateLimiter, openaiRateLimiter };
+
+  // Stream candidates into a fixed pool of workers, bounded by config.openai.concurrency
+  const titles = iterateEnrichmentCandidates(options, progress);
+
+  await runWorkerPool(titles, { concurrency: config.openai.concurrency }, (title) =>
+    enrichTitle(title, options, clients, progress)
+  );
+
+  progress.saveCheckpoint();
 
   // Final summary
   info("Enrichment pipeline completed", progress.getSummary());
@@ -3,13 +3,18 @@
  * Re-fetch TMDB metadata for existing titles in the database
  */
 
-import { fetchTitles, updateTitle, getTitleCount } from "../lib/supabase.js";
+import { config } from "../config.js";
+import { iterateTitles, getTitleCount, UpdateBuffer, parseMinPopularity } from "../lib/supabase.js";
 import { createTMDBRateLimiter } from "../lib/rate-limiter.js";
 import { ProgressTracker } from "../lib/progress.js";
-import { initFileLogging, closeFileLogging, info, error, warn } from "../lib/logger.js";
+import { runWorkerPool } from "../lib/concurrency.js";
+import { initFileLogging, closeFileLogging, info, error, warn, debug } from "../lib/logger.js";
 import { createTMDBClient } from "../tmdb/client.js";
 import { extractAllMetadata } from "../tmdb/extractors.js";
 
+// Only the fields needed to look a title up in TMDB (skips heavy embedding columns)
+const REFRESH_COLUMNS = "id,kind,title";
+
 /**
  * Parse command line arguments
  * @returns {Object}
@@ -21,6 +26,8 @@ function parseArgs() {
     offset: 0,
     kind: null,
     resume: false,
+    useCache: false, // refresh exists to pull current data, so the cache is opt-in
+    minPopularity: null,
   };
 
   for (let i = 0; i < args.length; i++) {
@@ -36,12 +43,71 @@ function parseArgs() {
       options.kind = "tv";
     } else if (arg === "--resume") {
       options.resume = true;
+    } else if (arg === "--use-cache") {
+      options.useCache = true;
+    } else if (arg === "--min-popularity" && args[i + 1]) {
+      options.minPopularity = parseMinPopularity(args[++i]);
     }
   }
 
   return options;
 }
 
+/**
+ * Re-fetch TMDB metadata for a single title and queue it for writing
+ * Success is recorded when the buffer flushes
+ * @param {Object} title
+ * @param {import("../tmdb/client.js").TMDBClient} tmdb
+ * @param {UpdateBuffer} buffer
+ * @param {ProgressTracker} progress
+ */
+async function refreshTitle(title, tmdb, buffer, progress) {
+  try {
+    debug(`Processing: ${title.title} (${title.id})`);
+
+    // Fetch fresh TMDB data
+    const tmdbData = await tmdb.getDetails(title.id, title.kind);
+
+    if (!tmdbData) {
+      warn(`TMDB data not found for: ${title.title} (${title.id})`);
+      progress.recordFailure(title.id);
+      return;
+    }
+
+    // Extract all metadata
+    const extracted = extractAllMetadata(tmdbData, title.kind);
+
+    // Queue database update (only columns that exist)
+    await buffer.add({
+      id: title.id,
+      title: extracted.title,
+      original_title: extracted.original_title,
+      overview: extracted.overview,
+      tagline: extracted.tagline,
+      release_date: extracted.release_date,
+      popularity: extracted.popularity,
+      vote_average: extracted.vote_average,
+      vote_count: extracted.vote_count,
+      runtime_minutes: extracted.runtime_minutes,
+      poster_path: extracted.poster_path,
+      backdrop_path: extracted.backdrop_path,
+      cast: extracted.cast,
+      director: extracted.director,
+      creators: extracted.creators,
+      writers: extracted.writers,
+      genres: extracted.genres,
+      keywords: extracted.keywords,
+      certification: extracted.certification,
+      production_countries: extracted.production_countries,
+      collection_id: extracted.collection_id,
+      collection_name: extracted.collection_name,
+    });
+  } catch (err) {
+    error(`Error processing ${title.title} (${title.id})`, { error: err.message });
+    progress.recordFailure(title.id);
+  }
+}
+
 /**
  * Run the refresh pipeline
  */
@@ -61,7 +127,7 @@ async function run() {
   }
 
   // Get total count
-  const totalCount = await getTitleCount({ kind: options.kind });
+  const totalCount = await getTitleCount({ kind: options.kind, minPopularity: options.minPopularity });
   const availableTitles = totalCount - options.offset;
   progress.setTotal(options.limit ? Math.min(availableTitles, options.limit) : availableTitles);
 
@@ -69,75 +135,38 @@ async function run() {
 
   // Create TMDB client
   const rateLimiter = createTMDBRateLimiter();
-  const tmdb = createTMDBClient(rateLimiter);
+  const tmdb = createTMDBClient(rateLimiter, { cache: options.useCache });
+
+  // Batch database writes; progress is recorded once rows are persisted
+  const buffer = new UpdateBuffer({
+    onFlush: ({ succeeded, failed }) => {
+      succeeded.forEach((id) => progress.recordSuccess(id));
+      failed.forEach((id) => progress.recordFailure(id));
+      progress.printProgress();
+    },
+  });
 
-  // Fetch titles to process
-  const titles = await fetchTitles({
+  // Stream titles from the database into a fixed pool of workers;
+  // the rate limiter still paces request starts
+  const titles = iterateTitles({
+    columns: REFRESH_COLUMNS,
     limit: options.limit,
     offset: options.offset,
     kind: options.kind,
+    minPopularity: options.minPopularity,
   });
 
-  info(`Fetched ${titles.length} titles from database`);
-
-  // Process each title
-  for (const title of titles) {
+  await runWorkerPool(titles, { concurrency: config.tmdb.concurrency }, async (title) => {
     // Skip if already processed (resume mode)
     if (progress.isProcessed(title.id)) {
-      continue;
+      return;
     }
 
-    try {
-      info(`Processing: ${title.title} (${title.id})`);
-
-      // Fetch fresh TMDB data
-      const tmdbData = await tmdb.getDetails(title.id, title.kind);
-
-      if (!tmdbData) {
-        warn(`TMDB data not found for: ${title.title} (${title.id})`);
-        progress.recordFailure(title.id);
-        continue;
-      }
-
-      // Extract all metadata
-      const extracted = extractAllMetadata(tmdbData, title.kind);
-
-      // Update database (only columns that exist)
-      await updateTitle(title.id, {
-        title: extracted.title,
-        original_title: extracted.original_title,
-        overview: extracted.overview,
-        tagline: extracted.tagline,
-        release_date: extracted.release_date,
-        popularity: extracted.popularity,
-        vote_average: extracted.vote_average,
-        vote_count: extracted.vote_count,
-        runtime_minutes: extracted.runtime_minutes,
-        poster_path: extracted.poster_path,
-        backdrop_path: extracted.backdrop_path,
-        cast: extracted.cast,
-        director: extracted.director,
-        creators: extracted.creators,
-        writers: extracted.writers,
-        genres: extracted.genres,
-        keywords: extracted.keywords,
-        certification: extracted.certification,
-        production_countries: extracted.production_countries,
-        collection_id: extracted.collection_id,
-        collection_name: extracted.collection_name,
-      });
-
-      progress.recordSuccess(title.id);
-
-      // Print progress every 100 items
-      if (progress.processed % 100 === 0) {
-        progress.printProgress();
-      }
-    } catch (err) {
-      error(`Error processing ${title.title} (${title.id})`, { error: err.message });
-      progress.recordFailure(title.id);
-    }
-  }
+    await refreshTitle(title, tmdb, buffer, progress);
+  });
+
+  // Write any remaining rows
+  await buffer.flush();
 
   // Final checkpoint
   progress.saveCheckpoint();
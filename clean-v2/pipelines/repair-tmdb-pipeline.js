@@ -4,9 +4,11 @@
  */
 
 import "dotenv/config";
-import { getSupabase, updateTitle } from "../lib/supabase.js";
-import { createTMDBRateLimiter } from "../lib/rate-limiter.js";
+import { config } from "../config.js";
+import { getSupabase, updateTitle, filterMinPopularity, parseMinPopularity } from "../lib/supabase.js";
+import { createTMDBRateLimiter, createOpenAIRateLimiter } from "../lib/rate-limiter.js";
 import { ProgressTracker } from "../lib/progress.js";
+import { AsyncQueue, runWorkerPool } from "../lib/concurrency.js";
 import { initFileLogging, closeFileLogging, info, error, warn, debug } from "../lib/logger.js";
 import { createTMDBClient } from "../tmdb/client.js";
 import { extractAllMetadata } from "../tmdb/extractors.js";
@@ -28,6 +30,37 @@ const TMDB_REPAIR_COLUMNS = `
   tmdb_repair_status, tmdb_repair_attempted_at, tmdb_repair_error
 `.replace(/\s+/g, "");
 
+// TMDB sub-resources each repairable field is extracted from.
+// Fields not listed (overview, tagline, genres, runtime) come with the base details.
+const APPEND_BY_FIELD = {
+  movie: {
+    director: ["credits"],
+    cast: ["credits"],
+    writers: ["credits"],
+    keywords: ["keywords"],
+    certification: ["release_dates"],
+  },
+  tv: {
+    creators: ["credits"],
+    cast: ["credits", "aggregate_credits"],
+    writers: ["credits", "aggregate_credits"],
+    keywords: ["keywords"],
+    certification: ["content_ratings"],
+  },
+};
+
+/**
+ * Build the append_to_response list for a title's missing fields
+ * @param {string[]} missing - From diagnoseMissingTMDBFields
+ * @param {"movie"|"tv"} kind
+ * @returns {string} - Comma-separated sub-resources (empty if none are needed)
+ */
+function appendForMissing(missing, kind) {
+  const byField = APPEND_BY_FIELD[kind] || {};
+  const append = new Set(missing.flatMap((field) => byField[field] || []));
+  return [...append].sort().join(",");
+}
+
 /**
  * Parse command line arguments
  */
@@ -41,6 +74,8 @@ function parseArgs() {
     field: null,
     retryErrors: false,
     resume: false,
+    noCache: false,
+    minPopularity: 0.5, // Skip near-zero popularity titles; pass 0 to include all
     skipEmbeddings: false,
   };
 
@@ -60,6 +95,10 @@ function parseArgs() {
       options.retryErrors = true;
     } else if (arg === "--resume") {
       options.resume = true;
+    } else if (arg === "--no-cache") {
+      options.noCache = true;
+    } else if (arg === "--min-popularity" && args[i + 1]) {
+      options.minPopularity = parseMinPopularity(args[++i]);
     } else if (arg === "--skip-embeddings") {
       options.skipEmbeddings = true;
     } else if (arg === "--help" || arg === "-h") {
@@ -87,6 +126,8 @@ Options:
   --retry-errors    Re-attempt previously failed API calls
   --resume          Resume from checkpoint
   --skip-embeddings Skip embedding regeneration (faster)
+  --no-cache        Ignore cached TMDB responses from previous runs
+  --min-popularity <n>  Only titles with popularity above n (default: 0.5, 0 = all)
   --help, -h        Show this help
 
 Examples:
@@ -126,6 +167,9 @@ async function findTitlesNeedingTMDBRepair(options) {
       query = query.eq("kind", "tv");
     }
 
+    // Skip obscure titles server-side so they don't spend TMDB budget
+    query = filterMinPopularity(query, options.minPopularity);
+
     // Random order (no popularity bias)
     query = query.order("id", { ascending: true }).range(offset, offset + batchSize - 1);
 
@@ -153,25 +197,26 @@ async function findTitlesNeedingTMDBRepair(options) {
 }
 
 /**
- * Repair a single title's TMDB metadata
+ * Fetch TMDB data for a title and collect the missing fields it fills
+ * Nothing is written here; see saveTMDBRepair().
+ * @returns {Promise<Object>} - { title, status, updates, fields, error }
  */
-async function repairTitleTMDB(title, tmdb, dryRun, skipEmbeddings = false) {
+async function fetchTMDBRepair(title, tmdb) {
   const diagnosis = diagnoseMissingTMDBFields(title);
-  const updates = {};
-  let statusUpdate = null;
+  const repair = { title, status: null, updates: {}, fields: [], error: null };
 
   try {
-    // Fetch fresh data from TMDB
-    const tmdbData = await tmdb.getDetails(title.id, title.kind);
+    // Fetch fresh data from TMDB, appending only what the missing fields need
+    const append = appendForMissing(diagnosis.missing, title.kind);
+    const tmdbData = await tmdb.getDetails(title.id, title.kind, { append });
 
     if (!tmdbData) {
       // Title deleted from TMDB
-      statusUpdate = buildTMDBRepairStatus("not_found", "Title not found in TMDB");
-      return { id: title.id, title: title.title, status: "not_found", updates: [] };
+      repair.status = "not_found";
+      return repair;
     }
 
     const extracted = extractAllMetadata(tmdbData, title.kind);
-    let fieldsRepaired = 0;
 
     // Only update fields that were missing AND have TMDB data
     for (const field of diagnosis.missing) {
@@ -182,66 +227,95 @@ async function repairTitleTMDB(title, tmdb, dryRun, skipEmbeddings = false) {
         // Handle empty strings
         if (typeof value === "string" && value.trim() === "") continue;
 
-        updates[field] = value;
-        fieldsRepaired++;
+        repair.updates[field] = value;
       }
     }
 
-    // Regenerate embeddings if any TMDB fields were updated (unless skipped)
-    // TMDB fields affect: metadata_embedding (cast, director, genres, keywords)
-    //                     content_embedding (overview, profile, themes)
-    if (fieldsRepaired > 0 && !skipEmbeddings) {
-      const merged = { ...title, ...updates };
-      debug(`Regenerating embeddings for: ${title.title}`);
-      const embeddings = await generateEmbeddingsForTitle(merged);
+    repair.fields = Object.keys(repair.updates);
+    repair.status = repair.fields.length > 0 ? "success" : "no_data";
+  } catch (err) {
+    // Network or API error
+    repair.status = "api_error";
+    repair.error = err.message;
+  }
 
-      if (embeddings.metadata) {
-        updates.metadata_embedding = embeddings.metadata;
-      }
-      if (embeddings.content) {
-        updates.content_embedding = embeddings.content;
-      }
-      // Also refresh vibe_embedding to keep all in sync
-      if (embeddings.vibe) {
-        updates.vibe_embedding = embeddings.vibe;
-      }
-    }
+  return repair;
+}
 
-    // Determine status
-    if (fieldsRepaired === 0) {
-      statusUpdate = buildTMDBRepairStatus("no_data", "TMDB has no data for missing fields");
-    } else {
-      statusUpdate = buildTMDBRepairStatus("success");
-    }
+/**
+ * Regenerate embeddings for a repaired title
+ * TMDB fields affect: metadata_embedding (cast, director, genres, keywords)
+ *                     content_embedding (overview, profile, themes)
+ * @param {Object} repair - From fetchTMDBRepair(), with status "success"
+ * @param {import("../lib/rate-limiter.js").TokenBucket} openaiRateLimiter
+ */
+async function addRepairEmbeddings(repair, openaiRateLimiter) {
+  const merged = { ...repair.title, ...repair.updates };
+  debug(`Regenerating embeddings for: ${repair.title.title}`);
 
-    // Apply updates
-    if (!dryRun && (Object.keys(updates).length > 0 || statusUpdate)) {
-      await updateTitle(title.id, { ...updates, ...statusUpdate });
-    }
+  try {
+    await openaiRateLimiter.acquire();
+    const embeddings = await generateEmbeddingsForTitle(merged);
 
-    return {
-      id: title.id,
-      title: title.title,
-      status: statusUpdate?.tmdb_repair_status || "success",
-      updates: Object.keys(updates).filter(k => !k.includes("embedding") && !k.includes("repair")),
-      embeddingsRefreshed: fieldsRepaired > 0 && !skipEmbeddings,
-      missing: diagnosis.missing,
-    };
+    if (embeddings.metadata) {
+      repair.updates.metadata_embedding = embeddings.metadata;
+    }
+    if (embeddings.content) {
+      repair.updates.content_embedding = embeddings.content;
+    }
+    // Also refresh vibe_embedding to keep all in sync
+    if (embeddings.vibe) {
+      repair.updates.vibe_embedding = embeddings.vibe;
+    }
   } catch (err) {
-    // Network or API error
-    statusUpdate = buildTMDBRepairStatus("api_error", err.message);
+    repair.status = "api_error";
+    repair.error = err.message;
+  }
+}
 
-    if (!dryRun) {
-      await updateTitle(title.id, statusUpdate);
+/**
+ * Write a repair's updates and status, and record the outcome in progress and stats
+ * Not-found titles are left unchanged.
+ * @param {Object} repair - From fetchTMDBRepair()
+ * @param {ProgressTracker} progress
+ * @param {Object} stats - Counts by status
+ */
+async function saveTMDBRepair(repair, progress, stats) {
+  const { title } = repair;
+
+  try {
+    if (repair.status === "success") {
+      await updateTitle(title.id, { ...repair.updates, ...buildTMDBRepairStatus("success") });
+    } else if (repair.status === "no_data") {
+      await updateTitle(title.id, buildTMDBRepairStatus("no_data", "TMDB has no data for missing fields"));
+    } else if (repair.status === "api_error") {
+      await updateTitle(title.id, buildTMDBRepairStatus("api_error", repair.error));
     }
+  } catch (err) {
+    error(`Error processing ${title.title}`, { error: err.message });
+    progress.recordFailure(title.id);
+    return;
+  }
+
+  stats[repair.status] = (stats[repair.status] || 0) + 1;
+
+  if (repair.status === "success") {
+    debug(`Repaired: ${title.title} -> ${repair.fields.join(", ")}`);
+    progress.recordSuccess(title.id);
+  } else if (repair.status === "not_found") {
+    warn(`Not found: ${title.title}`);
+    progress.recordFailure(title.id);
+  } else if (repair.status === "no_data") {
+    debug(`No TMDB data: ${title.title}`);
+    progress.recordFailure(title.id);
+  } else {
+    error(`API error: ${title.title} - ${repair.error}`);
+    progress.recordFailure(title.id);
+  }
 
-    return {
-      id: title.id,
-      title: title.title,
-      status: "api_error",
-      error: err.message,
-      updates: [],
-    };
+  // Print progress periodically
+  if (progress.processed % 100 === 0) {
+    progress.printProgress();
   }
 }
 
@@ -256,7 +330,7 @@ async function run() {
 
   // Create rate limiter and client
   const tmdbRateLimiter = createTMDBRateLimiter();
-  const tmdb = createTMDBClient(tmdbRateLimiter);
+  const tmdb = createTMDBClient(tmdbRateLimiter, { cache: !options.noCache });
 
   // Find titles needing repair
   info("Finding titles needing TMDB repair...");
@@ -301,43 +375,36 @@ async function run() {
     api_error: 0,
   };
 
-  // Process titles
-  for (const title of titles) {
+  // Two pipelined stages: TMDB workers hand repaired titles to embedding
+  // workers as soon as they're fetched, so embeddings for early titles are
+  // generated while later titles are still being fetched. Each stage has
+  // its own concurrency and rate limiter.
+  const openaiRateLimiter = createOpenAIRateLimiter();
+  const embedQueue = new AsyncQueue(config.pipeline.queueSize);
+
+  const fetching = runWorkerPool(titles, { concurrency: config.tmdb.concurrency }, async (title) => {
     if (progress.isProcessed(title.id)) {
       progress.recordSkip(title.id);
-      continue;
+      return;
     }
 
-    try {
-      const result = await repairTitleTMDB(title, tmdb, false, options.skipEmbeddings);
-
-      stats[result.status] = (stats[result.status] || 0) + 1;
-
-      if (result.status === "success" && result.updates.length > 0) {
-        info(`Repaired: ${title.title} -> ${result.updates.join(", ")}`);
-        progress.recordSuccess(title.id);
-      } else if (result.status === "not_found") {
-        warn(`Not found: ${title.title}`);
-        progress.recordFailure(title.id);
-      } else if (result.status === "no_data") {
-        debug(`No TMDB data: ${title.title}`);
-        progress.recordFailure(title.id);
-      } else if (result.status === "api_error") {
-        error(`API error: ${title.title} - ${result.error}`);
-        progress.recordFailure(title.id);
-      } else {
-        progress.recordSuccess(title.id);
-      }
+    const repair = await fetchTMDBRepair(title, tmdb);
 
-      // Print progress periodically
-      if (progress.processed % 100 === 0) {
-        progress.printProgress();
-      }
-    } catch (err) {
-      error(`Error processing ${title.title}`, { error: err.message });
-      progress.recordFailure(title.id);
+    if (repair.status === "success" && !options.skipEmbeddings) {
+      await embedQueue.put(repair);
+    } else {
+      await saveTMDBRepair(repair, progress, stats);
     }
-  }
+  }).finally(() => embedQueue.close());
+
+  const embedding = runWorkerPool(embedQueue, { concurrency: config.openai.concurrency }, async (repair) => {
+    await addRepairEmbeddings(repair, openaiRateLimiter);
+    await saveTMDBRepair(repair, progress, stats);
+  });
+
+  const [fetched, embedded] = await Promise.allSettled([fetching, embedding]);
+  if (fetched.status === "rejected") throw fetched.reason;
+  if (embedded.status === "rejected") throw embedded.reason;
 
   // Final summary
   progress.saveCheckpoint();
@@ -1,31 +1,45 @@
 import { config, getTMDBToken } from "../config.js";
-import { retry, isNotFoundError } from "../lib/retry.js";
+import { retry, isNotFoundError, isRateLimitError } from "../lib/retry.js";
 import { createLogger } from "../lib/logger.js";
+import { DiskCache } from "../lib/cache.js";
+import { discardBody } from "../lib/http.js";
 
 const log = createLogger("[TMDB]");
 
+// Sub-resources fetched alongside title details in the same request
+const MOVIE_APPEND_TO_RESPONSE = "credits,keywords,release_dates,external_ids";
+const TV_APPEND_TO_RESPONSE = "credits,aggregate_credits,keywords,content_ratings,external_ids";
+
 /**
  * TMDB API Client with retry and rate limiting
  */
 export class TMDBClient {
   /**
-   * @param {import("../lib/rate-limiter.js").RateLimiter} rateLimiter
+   * @param {import("../lib/rate-limiter.js").RateLimiter|import("../lib/rate-limiter.js").TokenBucket} rateLimiter
+   * @param {Object} [options]
+   * @param {boolean} [options.cache=true] - Cache title details on disk between runs
    */
-  constructor(rateLimiter) {
+  constructor(rateLimiter, { cache = true } = {}) {
     this.token = getTMDBToken();
     this.baseUrl = config.tmdb.baseUrl;
+    // Built once and reused; fetch does not mutate the headers object
+    this.headers = {
+      Authorization: `Bearer ${this.token}`,
+      Accept: "application/json",
+    };
     this.rateLimiter = rateLimiter;
+    this.cache = cache ? new DiskCache("tmdb") : null;
   }
 
   /**
    * Make a request to the TMDB API
    * @param {string} endpoint - API endpoint (e.g., "/movie/123")
    * @param {Object} [params] - Query parameters
-   * @returns {Promise<Object>}
+   * @param {Object} [options]
+   * @param {boolean} [options.raw=false] - Return the unparsed response body
+   * @returns {Promise<Object|string>}
    */
-  async request(endpoint, params = {}) {
-    await this.rateLimiter.acquire();
-
+  async request(endpoint, params = {}, { raw = false } = {}) {
     const url = new URL(`${this.baseUrl}${endpoint}`);
     Object.entries(params).forEach(([key, value]) => {
       if (value !== undefined && value !== null) {
@@ -35,28 +49,35 @@ export class TMDBClient {
 
     return retry(
       async () => {
+        // Inside the retried function so every attempt, including retries, is paced
+        await this.rateLimiter.acquire();
+
         const response = await fetch(url.toString(), {
           method: "GET",
-          headers: {
-            Authorization: `Bearer ${this.token}`,
-            Accept: "application/json",
-          },
+          headers: this.headers,
           signal: AbortSignal.timeout(config.tmdb.timeout),
         });
 
         if (!response.ok) {
+          await discardBody(response);
           const error = new Error(`TMDB API error: ${response.status}`);
           error.status = response.status;
           error.response = { status: response.status, headers: response.headers };
           throw error;
         }
 
-        return response.json();
+        const body = await response.text();
+        return raw ? body : JSON.parse(body);
       },
       {
         maxRetries: config.tmdb.retries,
         onRetry: (error, attempt, waitTime) => {
           log.warn(`Retry ${attempt} after ${waitTime}ms`, { endpoint, error: error.message });
+
+          // The limit is per token, so back off the whole pool, not just this request
+          if (isRateLimitError(error)) {
+            this.rateLimiter.pause(waitTime);
+          }
         },
       }
     );
@@ -65,13 +86,17 @@ export class TMDBClient {
   /**
    * Get movie details with credits, keywords, etc.
    * @param {number} id - TMDB movie ID
-   * @returns {Promise<Object|null>} - Movie data or null if not found
+   * @param {Object} [options] - See request()
+   * @param {string} [options.append] - Sub-resources to append (defaults to all used by the extractors)
+   * @returns {Promise<Object|string|null>} - Movie data or null if not found
    */
-  async getMovieDetails(id) {
+  async getMovieDetails(id, { append = MOVIE_APPEND_TO_RESPONSE, ...options } = {}) {
     try {
-      return await this.request(`/movie/${id}`, {
-        append_to_response: "credits,keywords,release_dates,external_ids",
-      });
+      return await this.request(
+        `/movie/${id}`,
+        { append_to_response: append || undefined },
+        options
+      );
     } catch (error) {
       if (isNotFoundError(error)) {
         log.warn(`Movie ${id} not found`);
@@ -84,13 +109,17 @@ export class TMDBClient {
   /**
    * Get TV show details with credits, keywords, etc.
    * @param {number} id - TMDB TV ID
-   * @returns {Promise<Object|null>} - TV data or null if not found
+   * @param {Object} [options] - See request()
+   * @param {string} [options.append] - Sub-resources to append (defaults to all used by the extractors)
+   * @returns {Promise<Object|string|null>} - TV data or null if not found
    */
-  async getTVDetails(id) {
+  async getTVDetails(id, { append = TV_APPEND_TO_RESPONSE, ...options } = {}) {
     try {
-      return await this.request(`/tv/${id}`, {
-        append_to_response: "credits,aggregate_credits,keywords,content_ratings,external_ids",
-      });
+      return await this.request(
+        `/tv/${id}`,
+        { append_to_response: append || undefined },
+        options
+      );
     } catch (error) {
       if (isNotFoundError(error)) {
         log.warn(`TV show ${id} not found`);
@@ -102,18 +131,52 @@ export class TMDBClient {
 
   /**
    * Get details for a title (movie or TV)
+   * Served from the disk cache when available. The cache stores the raw
+   * response body, so each response is parsed once and never re-serialized.
+   *
+   * Pass `append` to fetch only some sub-resources (e.g. "keywords"), which
+   * keeps responses small when only a few fields are needed. A cached
+   * full response is reused for partial requests.
    * @param {number} id - TMDB ID
    * @param {"movie"|"tv"} kind - Type of title
+   * @param {Object} [options]
+   * @param {string} [options.append] - Sub-resources to append (defaults to all)
    * @returns {Promise<Object|null>}
    */
-  async getDetails(id, kind) {
+  async getDetails(id, kind, { append } = {}) {
+    const fullKey = `${kind}:${id}:details`;
+    const cacheKey = append === undefined ? fullKey : `${fullKey}:${append}`;
+
+    if (this.cache) {
+      const keys = cacheKey === fullKey ? [fullKey] : [fullKey, cacheKey];
+      for (const key of keys) {
+        const cached = await this.cache.getRaw(key);
+        if (cached !== undefined) {
+          log.debug(`Cache hit for ${key}`);
+          return JSON.parse(cached);
+        }
+      }
+    }
+
+    let body;
     if (kind === "movie") {
-      return this.getMovieDetails(id);
+      body = await this.getMovieDetails(id, { append, raw: true });
     } else if (kind === "tv") {
-      return this.getTVDetails(id);
+      body = await this.getTVDetails(id, { append, raw: true });
     } else {
       throw new Error(`Invalid kind: ${kind}`);
     }
+
+    // Don't cache misses - a title may be (re)published later
+    if (body === null) return null;
+
+    if (this.cache) {
+      await this.cache.setRaw(cacheKey, body, config.tmdb.cacheTtlMs).catch((error) => {
+        log.warn(`Failed to cache ${cacheKey}`, { error: error.message });
+      });
+    }
+
+    return JSON.parse(body);
   }
 
   /**
@@ -145,9 +208,10 @@ export class TMDBClient {
 
 /**
  * Create a TMDB client with default rate limiter
- * @param {import("../lib/rate-limiter.js").RateLimiter} rateLimiter
+ * @param {import("../lib/rate-limiter.js").RateLimiter|import("../lib/rate-limiter.js").TokenBucket} rateLimiter
+ * @param {Object} [options] - See TMDBClient constructor
  * @returns {TMDBClient}
  */
-export function createTMDBClient(rateLimiter) {
-  return new TMDBClient(rateLimiter);
+export function createTMDBClient(rateLimiter, options) {
+  return new TMDBClient(rateLimiter, options);
 }
@@ -97,16 +97,11 @@ export function extractWriters(credits, limit = 5) {
 }
 
 /**
- * Extract keywords
- * @param {Object} keywordsData - Keywords object from TMDB (different structure for movies vs TV)
+ * Map keyword objects to names
+ * @param {Array<{name: string}>} keywords
  * @returns {string[]}
  */
-export function extractKeywords(keywordsData) {
-  if (!keywordsData) return [];
-
-  // Movies: keywords.keywords, TV: keywords.results
-  const keywords = keywordsData.keywords || keywordsData.results || [];
-
+function keywordNames(keywords) {
   if (!Array.isArray(keywords)) return [];
 
   return keywords
@@ -115,6 +110,37 @@ export function extractKeywords(keywordsData) {
     .slice(0, 50);
 }
 
+/**
+ * Extract keywords from a movie response (list lives under keywords.keywords)
+ * @param {Object} keywordsData - Keywords object from TMDB
+ * @returns {string[]}
+ */
+export function extractMovieKeywords(keywordsData) {
+  return keywordNames(keywordsData?.keywords);
+}
+
+/**
+ * Extract keywords from a TV response (list lives under keywords.results)
+ * @param {Object} keywordsData - Keywords object from TMDB
+ * @returns {string[]}
+ */
+export function extractTVKeywords(keywordsData) {
+  return keywordNames(keywordsData?.results);
+}
+
+/**
+ * Extract keywords
+ * Prefer extractMovieKeywords/extractTVKeywords when the kind is known.
+ * @param {Object} keywordsData - Keywords object from TMDB (different structure for movies vs TV)
+ * @returns {string[]}
+ */
+export function extractKeywords(keywordsData) {
+  if (!keywordsData) return [];
+
+  // Movies: keywords.keywords, TV: keywords.results
+  return keywordNames(keywordsData.keywords || keywordsData.results || []);
+}
+
 /**
  * Normalize genres to standard list
  * @param {Array<{id: number, name: string}>} genres - Genres from TMDB
@@ -132,40 +158,59 @@ export function normalizeGenres(genres) {
   return [...new Set(normalized)];
 }
 
+// Certification regions in priority order
+const CERTIFICATION_REGIONS = ["US", "GB", "CA"];
+
 /**
- * Extract certification (age rating)
- * @param {Object} data - Movie or TV data with release_dates or content_ratings
- * @param {"movie"|"tv"} kind
+ * Extract certification (age rating) from a movie's release_dates
+ * @param {Object} data - Movie data
  * @returns {string|null}
  */
-export function extractCertification(data, kind) {
-  const regions = ["US", "GB", "CA"]; // Priority order
+export function extractMovieCertification(data) {
+  const releaseDates = data?.release_dates?.results;
+  if (!releaseDates) return null;
+
+  for (const region of CERTIFICATION_REGIONS) {
+    const release = releaseDates.find((r) => r.iso_3166_1 === region);
+    if (release?.release_dates?.[0]?.certification) {
+      return release.release_dates[0].certification;
+    }
+  }
 
-  if (kind === "movie") {
-    const releaseDates = data?.release_dates?.results;
-    if (!releaseDates) return null;
+  return null;
+}
 
-    for (const region of regions) {
-      const release = releaseDates.find((r) => r.iso_3166_1 === region);
-      if (release?.release_dates?.[0]?.certification) {
-        return release.release_dates[0].certification;
-      }
-    }
-  } else if (kind === "tv") {
-    const contentRatings = data?.content_ratings?.results;
-    if (!contentRatings) return null;
-
-    for (const region of regions) {
-      const rating = contentRatings.find((r) => r.iso_3166_1 === region);
-      if (rating?.rating) {
-        return rating.rating;
-      }
+/**
+ * Extract certification (age rating) from a TV show's content_ratings
+ * @param {Object} data - TV data
+ * @returns {string|null}
+ */
+export function extractTVCertification(data) {
+  const contentRatings = data?.content_ratings?.results;
+  if (!contentRatings) return null;
+
+  for (const region of CERTIFICATION_REGIONS) {
+    const rating = contentRatings.find((r) => r.iso_3166_1 === region);
+    if (rating?.rating) {
+      return rating.rating;
     }
   }
 
   return null;
 }
 
+/**
+ * Extract certification (age rating)
+ * @param {Object} data - Movie or TV data with release_dates or content_ratings
+ * @param {"movie"|"tv"} kind
+ * @returns {string|null}
+ */
+export function extractCertification(data, kind) {
+  if (kind === "movie") return extractMovieCertification(data);
+  if (kind === "tv") return extractTVCertification(data);
+  return null;
+}
+
 /**
  * Extract production countries
  * @param {Object} data - Movie or TV data
@@ -194,17 +239,13 @@ export function extractCollection(data) {
 }
 
 /**
- * Extract all relevant data from TMDB response
+ * Extract the fields shared by movies and TV shows
  * @param {Object} data - Full TMDB response
- * @param {"movie"|"tv"} kind
+ * @param {Object} credits - Credits for the title
  * @returns {Object}
  */
-export function extractAllMetadata(data, kind) {
-  if (!data) return null;
-
-  const credits = kind === "tv" ? data.aggregate_credits || data.credits : data.credits;
-
-  const extracted = {
+function extractCommonMetadata(data, credits) {
+  return {
     // Core info
     title: data.title || data.name,
     original_title: data.original_title || data.original_name,
@@ -224,28 +265,77 @@ export function extractAllMetadata(data, kind) {
 
     // People
     cast: extractCast(credits),
-    director: kind === "movie" ? extractDirector(credits) : null,
-    creators: kind === "tv" ? extractCreators(data) : null,
     writers: extractWriters(credits),
 
     // Classification
     genres: normalizeGenres(data.genres),
-    keywords: extractKeywords(data.keywords),
-    certification: extractCertification(data, kind),
 
     // Location
     production_countries: extractProductionCountries(data),
 
-    // Collection (movies only)
-    collection_id: kind === "movie" ? extractCollection(data)?.id || null : null,
-    collection_name: kind === "movie" ? extractCollection(data)?.name || null : null,
-
     // External IDs
     imdb_id: data.imdb_id || data.external_ids?.imdb_id || null,
 
     // Store full payload for reference
     payload: data,
   };
+}
+
+/**
+ * Extract all relevant data from a movie response
+ * @param {Object} data - Full TMDB movie response
+ * @returns {Object}
+ */
+export function extractMovieMetadata(data) {
+  const collection = extractCollection(data);
+
+  return {
+    ...extractCommonMetadata(data, data.credits),
+    director: extractDirector(data.credits),
+    creators: null,
+    keywords: extractMovieKeywords(data.keywords),
+    certification: extractMovieCertification(data),
+    collection_id: collection?.id || null,
+    collection_name: collection?.name || null,
+  };
+}
+
+/**
+ * Extract all relevant data from a TV response
+ * @param {Object} data - Full TMDB TV response
+ * @returns {Object}
+ */
+export function extractTVMetadata(data) {
+  return {
+    ...extractCommonMetadata(data, data.aggregate_credits || data.credits),
+    director: null,
+    creators: extractCreators(data),
+    keywords: extractTVKeywords(data.keywords),
+    certification: extractTVCertification(data),
+    collection_id: null,
+    collection_name: null,
+  };
+}
+
+// Kind-specific extractors, resolved once per title instead of per field
+const METADATA_EXTRACTORS = {
+  movie: extractMovieMetadata,
+  tv: extractTVMetadata,
+};
+
+/**
+ * Extract all relevant data from TMDB response
+ * @param {Object} data - Full TMDB response
+ * @param {"movie"|"tv"} kind
+ * @returns {Object}
+ */
+export function extractAllMetadata(data, kind) {
+  if (!data) return null;
+
+  const extract = METADATA_EXTRACTORS[kind];
+  if (!extract) {
+    throw new Error(`Invalid kind: ${kind}`);
+  }
 
-  return extracted;
+  return extract(data);
 }
@@ -6,6 +6,7 @@
 import { config } from "../config.js";
 import { retry } from "../lib/retry.js";
 import { createLogger } from "../lib/logger.js";
+import { discardBody } from "../lib/http.js";
 
 const log = createLogger("[WikiContent]");
 
@@ -53,15 +54,12 @@ async function fetchArticleContent(title, rateLimiter) {
     origin: "*",
   });
 
-  const headers = {
-    "User-Agent": "MediaRecommendationSystem/1.0 (https://github.com/example; contact@example.com)",
-  };
-
   try {
     const response = await retry(
       async () => {
-        const res = await fetch(`${config.wikipedia.searchUrl}?${params}`, { headers });
+        const res = await fetch(`${config.wikipedia.searchUrl}?${params}`, { headers: config.wikipedia.headers });
         if (!res.ok) {
+          await discardBody(res);
           throw new Error(`Wikipedia API error: ${res.status}`);
         }
         return res.json();
@@ -6,11 +6,17 @@
 import { config } from "../config.js";
 import { retry } from "../lib/retry.js";
 import { createLogger } from "../lib/logger.js";
+import { discardBody } from "../lib/http.js";
 import { validateArticle, isObviouslyWrong } from "./validator.js";
 import { generateTitleVariations } from "./title-normalizer.js";
 
 const log = createLogger("[Wiki]");
 
+const JSON_HEADERS = {
+  ...config.wikipedia.headers,
+  Accept: "application/json",
+};
+
 // Roman numeral conversion for pattern generation
 const ROMAN_TO_ARABIC = {
   i: "1", ii: "2", iii: "3", iv: "4", v: "5",
@@ -201,17 +207,16 @@ export class WikipediaFetcher {
       const response = await retry(
         async () => {
           const res = await fetch(url, {
-            headers: {
-              Accept: "application/json",
-              "User-Agent": "MediaRecommendationSystem/1.0 (https://github.com/example; contact@example.com)",
-            },
+            headers: JSON_HEADERS,
           });
 
           if (res.status === 404) {
+            await discardBody(res);
             return null;
           }
 
           if (!res.ok) {
+            await discardBody(res);
             const error = new Error(`Wikipedia API error: ${res.status}`);
             error.status = res.status;
             throw error;
@@ -257,13 +262,12 @@ export class WikipediaFetcher {
       origin: "*",
     });
 
-    const headers = {
-      "User-Agent": "MediaRecommendationSystem/1.0 (https://github.com/example; contact@example.com)",
-    };
-
     try {
-      const response = await fetch(`${this.searchUrl}?${params}`, { headers });
-      if (!response.ok) return null;
+      const response = await fetch(`${this.searchUrl}?${params}`, { headers: config.wikipedia.headers });
+      if (!response.ok) {
+        await discardBody(response);
+        return null;
+      }
 
       const data = await response.json();
       const pages = data.query?.pages;
@@ -293,13 +297,12 @@ export class WikipediaFetcher {
       origin: "*",
     });
 
-    const headers = {
-      "User-Agent": "MediaRecommendationSystem/1.0 (https://github.com/example; contact@example.com)",
-    };
-
     try {
-      const response = await fetch(`${this.searchUrl}?${params}`, { headers });
-      if (!response.ok) return [];
+      const response = await fetch(`${this.searchUrl}?${params}`, { headers: config.wikipedia.headers });
+      if (!response.ok) {
+        await discardBody(response);
+        return [];
+      }
 
       const data = await response.json();
       // OpenSearch returns [query, titles, descriptions, urls]
@@ -337,7 +340,7 @@ export class WikipediaFetcher {
       const validation = validateArticle(article, title, year, kind, tmdbData);
 
       if (validation.isValid) {
-        log.info(`Found valid article: ${article.title}`, {
+        log.debug(`Found valid article: ${article.title}`, {
           confidence: validation.confidence,
           reasons: validation.reasons,
         });
@@ -382,7 +385,7 @@ export class WikipediaFetcher {
       const validation = validateArticle(article, title, year, kind, tmdbData);
 
       if (validation.isValid) {
-        log.info(`Found valid article via search: ${article.title}`, {
+        log.debug(`Found valid article via search: ${article.title}`, {
           confidence: validation.confidence,
           reasons: validation.reasons,
         });
@@ -400,7 +403,7 @@ export class WikipediaFetcher {
       });
     }
 
-    log.info(`No valid Wikipedia article found for: ${title} (${year})`);
+    log.debug(`No valid Wikipedia article found for: ${title} (${year})`);
     return null;
   }
 }
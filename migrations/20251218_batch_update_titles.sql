@@ -0,0 +1,36 @@
+-- Migration: Batch update RPC for titles
+-- Purpose: Let pipelines update many existing titles in one round-trip
+-- Impact: Replaces per-title UPDATE requests in the refresh pipeline (see UpdateBuffer)
+--
+-- UPDATE only: rows that no longer exist are skipped, never re-inserted,
+-- so no INSERT policy is needed. Runs as the caller (SECURITY INVOKER),
+-- so the same RLS UPDATE policy as a direct .update() applies.
+-- All rows in a call must have the same keys; only those columns are set.
+
+CREATE OR REPLACE FUNCTION batch_update_titles(rows jsonb)
+RETURNS SETOF bigint
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+  assignments text;
+BEGIN
+  SELECT string_agg(format('%I = p.%I', key, key), ', ')
+    INTO assignments
+    FROM jsonb_object_keys(rows->0) AS key
+   WHERE key <> 'id';
+
+  IF assignments IS NULL THEN
+    RETURN;
+  END IF;
+
+  RETURN QUERY EXECUTE format(
+    'UPDATE titles t
+        SET %s
+       FROM jsonb_populate_recordset(NULL::titles, $1) p
+      WHERE t.id = p.id
+  RETURNING t.id',
+    assignments
+  ) USING rows;
+END;
+$$;